@@ -8,4 +8,9 @@ setup(
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     python_requires=">=3.6",
+    entry_points={
+        "console_scripts": [
+            "studio-tools=studio_tools.cli.main:main",
+        ],
+    },
 )
\ No newline at end of file
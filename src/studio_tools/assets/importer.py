@@ -7,6 +7,8 @@ import logging
 from pathlib import Path
 from typing import List, Optional
 
+from studio_tools.filesystem.cache import MetadataCache, get_default_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,13 +17,15 @@ class AssetImporter:
     
     SUPPORTED_FORMATS = ['.fbx', '.abc', '.usd', '.obj']
     
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, fs_cache: Optional[MetadataCache] = None):
         """Initialize asset importer.
         
         Args:
             base_path: Base directory for asset storage
+            fs_cache: Metadata cache (defaults to the shared process cache)
         """
         self.base_path = Path(base_path)
+        self.fs_cache = fs_cache or get_default_cache()
         self.imported_assets = []
         logger.info(f"AssetImporter initialized with base path: {base_path}")
     
@@ -36,7 +40,7 @@ class AssetImporter:
         """
         asset_path = Path(asset_file)
         
-        if not asset_path.exists():
+        if not self.fs_cache.exists(asset_path):
             logger.error(f"Asset file not found: {asset_file}")
             return False
         
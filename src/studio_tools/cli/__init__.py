@@ -0,0 +1,12 @@
+"""
+CLI Sub-package
+
+Command line entry point and persistent worker daemon.
+"""
+
+from .main import main, run_command
+
+__all__ = [
+    "main",
+    "run_command"
+]
@@ -0,0 +1,7 @@
+"""Allow running the CLI with ``python -m studio_tools.cli``."""
+
+import sys
+
+from .main import main
+
+sys.exit(main())
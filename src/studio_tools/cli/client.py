@@ -0,0 +1,38 @@
+"""Client side of the studio-tools worker daemon protocol.
+
+Kept free of pipeline and server imports, so forwarding a command costs
+little more than connecting to the daemon's socket.
+"""
+
+import json
+import os
+import socket
+from typing import List, Optional, Tuple
+
+
+def send_request(socket_path: str, argv: List[str],
+                 timeout: Optional[float] = None) -> Tuple[int, str]:
+    """Send a command to a running daemon.
+
+    Args:
+        socket_path: Filesystem path of the daemon's Unix socket
+        argv: Command line arguments to run
+        timeout: Socket timeout in seconds (None = block)
+
+    Returns:
+        Tuple of (exit_code: int, output: str)
+
+    Raises:
+        OSError: If the daemon cannot be reached
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        request = {'argv': list(argv), 'cwd': os.getcwd()}
+        sock.sendall(json.dumps(request).encode('utf-8') + b"\n")
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("Daemon closed the connection without a response")
+    response = json.loads(line.decode('utf-8'))
+    return response['exit_code'], response['output']
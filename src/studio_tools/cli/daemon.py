@@ -0,0 +1,94 @@
+"""Persistent worker daemon for the studio-tools command line.
+
+The daemon listens on a Unix socket and runs commands against a single
+long-lived ToolContext, so configuration, caches and the worker pool are
+loaded once instead of once per invocation.
+
+Protocol: the client sends one JSON line ``{"argv": [...], "cwd": str}`` and
+receives one JSON line ``{"exit_code": int, "output": str}``. Relative paths
+in argv are resolved against the client's ``cwd``, not the daemon's.
+Clients connect with send_request() from studio_tools.cli.client.
+"""
+
+import io
+import json
+import logging
+import os
+import signal
+import socketserver
+from typing import Optional
+
+from studio_tools.cli.main import ToolContext, run_command
+
+logger = logging.getLogger(__name__)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handle a single command request from a client."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        out = io.StringIO()
+        try:
+            request = json.loads(line.decode('utf-8'))
+            exit_code = run_command(list(request['argv']), self.server.context, out,
+                                    cwd=request.get('cwd'))
+        except (ValueError, KeyError, TypeError) as e:
+            out.write(f"Invalid request: {e}\n")
+            exit_code = 2
+        response = {'exit_code': exit_code, 'output': out.getvalue()}
+        self.wfile.write(json.dumps(response).encode('utf-8') + b"\n")
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class ToolDaemon(socketserver.ThreadingUnixStreamServer):
+        """Threaded Unix socket server holding a shared ToolContext."""
+
+        daemon_threads = True
+
+        def __init__(self, socket_path: str, max_workers: Optional[int] = None):
+            """Initialize the daemon and bind its socket.
+
+            Args:
+                socket_path: Filesystem path of the Unix socket
+                max_workers: Size of the shared worker thread pool
+            """
+            self.socket_path = socket_path
+            self.context = ToolContext(max_workers=max_workers)
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            super().__init__(socket_path, _RequestHandler)
+            logger.info(f"ToolDaemon listening on: {socket_path}")
+
+        def server_close(self):
+            super().server_close()
+            self.context.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+else:
+    ToolDaemon = None
+
+
+def serve(socket_path: str, max_workers: Optional[int] = None) -> None:
+    """Run the worker daemon until interrupted.
+
+    Args:
+        socket_path: Filesystem path of the Unix socket
+        max_workers: Size of the shared worker thread pool
+    """
+    if ToolDaemon is None:
+        raise OSError("Unix sockets are not supported on this platform")
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    server = ToolDaemon(socket_path, max_workers=max_workers)
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("ToolDaemon interrupted, shutting down")
+    finally:
+        server.server_close()
@@ -0,0 +1,477 @@
+"""Command line interface for studio pipeline tools.
+
+Provides the ``studio-tools`` console script with subcommands for the most
+common pipeline tasks. Commands run in-process by default, or are forwarded
+to a persistent worker daemon when one is listening on ``--socket``.
+
+Pipeline modules are imported inside the command handlers, so a client that
+only forwards to the daemon pays for little more than the socket round-trip.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import List, Optional, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV_VAR = "STUDIO_TOOLS_SOCKET"
+
+# Parsed argument names holding file-system paths
+PATH_ARGUMENTS = ('paths', 'path', 'library', 'archive', 'project', 'cache', 'cold_storage')
+
+
+def _pipeline_setting(section: str, key: str, default: str) -> str:
+    """Look up a value from the ``pipeline`` section of pipeline.yaml.
+
+    Args:
+        section: Sub-section name (e.g. "publishing")
+        key: Setting name within the sub-section
+        default: Value returned when the setting is missing
+
+    Returns:
+        Configured value or the default
+    """
+    try:
+        from studio_tools.config import PIPELINE_CONFIG
+    except ImportError:
+        return default
+    pipeline = PIPELINE_CONFIG.get('pipeline', {}) or {}
+    return (pipeline.get(section, {}) or {}).get(key, default)
+
+
+class ToolContext:
+    """Long-lived state shared by commands.
+
+    A fresh context is created for every in-process invocation, while the
+    daemon keeps a single context alive so configuration, the metadata cache
+    and the worker pool stay warm between requests. Nothing in the context
+    keeps per-request results, so a long-running daemon does not grow.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """Initialize tool context.
+
+        Args:
+            max_workers: Size of the worker thread pool (None = auto)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from studio_tools.validation.asset_checker import AssetChecker
+
+        self.checker = AssetChecker()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def check_asset(self, asset_path: str) -> Tuple[bool, List[str]]:
+        """Check an asset without recording it in the checker's history.
+
+        Args:
+            asset_path: Path to the asset file
+
+        Returns:
+            Tuple of (success: bool, messages: List[str])
+        """
+        from studio_tools.validation.results import render_record
+
+        records = list(self.checker.check_records(asset_path))
+        return (all(record.passed for record in records),
+                [render_record(record) for record in records])
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        self.executor.shutdown(wait=True)
+
+
+class CommandExit(Exception):
+    """Raised by the argument parser instead of exiting the process."""
+
+    def __init__(self, status: int):
+        super().__init__(status)
+        self.status = status
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """Argument parser that writes to a given stream and never calls sys.exit.
+
+    The daemon runs commands in worker threads, so usage errors and help
+    text must be captured per request rather than written to the process
+    streams.
+    """
+
+    def __init__(self, *args, out: Optional[TextIO] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._out = out
+
+    def _print_message(self, message, file=None):
+        if message:
+            (self._out or file or sys.stderr).write(message)
+
+    def exit(self, status=0, message=None):
+        if message:
+            self._print_message(message)
+        raise CommandExit(status)
+
+
+def build_parser(out: Optional[TextIO] = None) -> argparse.ArgumentParser:
+    """Build the ``studio-tools`` argument parser.
+
+    Args:
+        out: Stream receiving help and usage messages
+
+    Returns:
+        Configured argument parser
+    """
+    parser = _ArgumentParser(
+        prog="studio-tools",
+        description="Studio pipeline tools",
+        out=out,
+    )
+    parser.add_argument(
+        "--socket",
+        default=os.environ.get(SOCKET_ENV_VAR),
+        help=f"Worker daemon socket (default: ${SOCKET_ENV_VAR})",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    subparsers.required = True
+
+    check = subparsers.add_parser("check", help="Validate asset files", out=out)
+    check.add_argument("paths", nargs="+", help="Asset files to check")
+    check.add_argument("-v", "--verbose", action="store_true",
+                       help="Print every check message")
+    check.add_argument("--format", choices=["text", "jsonl"], default="text",
+                       help="Output format (jsonl streams structured records)")
+
+    textures = subparsers.add_parser("check-textures",
+                                     help="Validate a texture library", out=out)
+    textures.add_argument("library", help="Texture library directory")
+    textures.add_argument("--processes", type=int, default=None,
+                          help="Worker processes (default: CPU count)")
+
+    publish = subparsers.add_parser("publish", help="Publish an asset", out=out)
+    publish.add_argument("name", help="Asset name")
+    publish.add_argument("path", help="Path to the asset file")
+    publish.add_argument("--version", type=int, default=None,
+                         help="Version number (auto-incremented if omitted)")
+    publish.add_argument("--archive", default=None,
+                         help="Archive directory (default: from pipeline.yaml)")
+
+    shots = subparsers.add_parser("create-shots", help="Create shot directories",
+                                  out=out)
+    shots.add_argument("shots", nargs="+", help="Shot names (e.g. SQ010_SH020)")
+    shots.add_argument("--project", default=None,
+                       help="Project directory (default: from pipeline.yaml)")
+    shots.add_argument("--maya-scene", action="store_true",
+                       help="Also create the main Maya scene file")
+
+    render = subparsers.add_parser("render", help="Show Arnold render setup",
+                                   out=out)
+    # A name, not a directory, so it must stay out of PATH_ARGUMENTS
+    render.add_argument("project_name", metavar="project", help="Project/shot name")
+    render.add_argument("--samples", type=int, default=None,
+                        help="Render samples")
+    render.add_argument("--layers", nargs="+", default=None,
+                        help="Render layer names")
+
+    du = subparsers.add_parser("du", help="Report shot disk usage", out=out)
+    du.add_argument("--project", default=None,
+                    help="Project directory (default: from pipeline.yaml)")
+    du.add_argument("--by", choices=["shot", "folder", "shot-folder"], default="shot",
+                    help="Group totals by shot, folder type, or both")
+    du.add_argument("--cache", default=None,
+                    help="Cache file for incremental reports")
+    du.add_argument("--workers", type=int, default=16,
+                    help="Threads used to walk shot folders")
+    du.add_argument("--top", type=int, default=None,
+                    help="Only show the largest N rows")
+
+    retention = subparsers.add_parser("retention",
+                                      help="Prune or move old published versions",
+                                      out=out)
+    retention.add_argument("--archive", default=None,
+                           help="Archive directory (default: from pipeline.yaml)")
+    retention.add_argument("--cold-storage", default=None,
+                           help="Move old versions here instead of deleting them")
+    retention.add_argument("--apply", action="store_true",
+                           help="Execute the plan (default is a dry run)")
+    retention.add_argument("--workers", type=int, default=2,
+                           help="Concurrent delete/move workers")
+    retention.add_argument("--rate", type=float, default=5.0,
+                           help="Maximum delete/move operations per second")
+
+    serve = subparsers.add_parser("serve", help="Run the persistent worker daemon",
+                                  out=out)
+    serve.add_argument("--workers", type=int, default=None,
+                       help="Worker thread pool size")
+
+    return parser
+
+
+def _cmd_check(args, context: ToolContext, out: TextIO) -> int:
+    if args.format == "jsonl":
+        from studio_tools.validation.results import write_jsonl
+
+
+        failed = False
+
+        def records():
+            nonlocal failed
+            for record in context.checker.iter_asset_checks(args.paths):
+                if not record.passed:
+                    failed = True
+                yield record
+
+        write_jsonl(records(), out)
+        return 1 if failed else 0
+
+    results = context.executor.map(context.check_asset, args.paths)
+    exit_code = 0
+    for path, (success, messages) in zip(args.paths, results):
+        out.write(f"{'PASS' if success else 'FAIL'} {path}\n")
+        if args.verbose or not success:
+            for msg in messages:
+                out.write(f"  {msg}\n")
+        if not success:
+            exit_code = 1
+    return exit_code
+
+
+def _cmd_check_textures(args, context: ToolContext, out: TextIO) -> int:
+    from studio_tools.validation.texture_checker import TextureChecker
+
+    report = TextureChecker().check_library(args.library, max_workers=args.processes)
+    exit_code = 0
+    for result in report['results']:
+        if not result.passed:
+            exit_code = 1
+            out.write(f"FAIL {result.path}\n")
+            for issue in result.issues:
+                out.write(f"  {issue}\n")
+    for material, missing in report['missing_channels'].items():
+        exit_code = 1
+        out.write(f"MISSING {material}: {', '.join(missing)}\n")
+    out.write(f"Checked {len(report['results'])} textures\n")
+    return exit_code
+
+
+def _cmd_publish(args, context: ToolContext, out: TextIO) -> int:
+    from studio_tools.publishing.publisher import AssetPublisher
+
+    archive = args.archive or _pipeline_setting(
+        'publishing', 'archive_path', "/studio/archive")
+    publisher = AssetPublisher(archive)
+    if not publisher.publish_asset(args.name, args.path, args.version):
+        out.write(f"Failed to publish {args.name}\n")
+        return 1
+    out.write(f"{json.dumps(publisher.get_published_assets()[-1])}\n")
+    return 0
+
+
+def _cmd_create_shots(args, context: ToolContext, out: TextIO) -> int:
+    from studio_tools.shots.shot_creator import ShotCreator
+
+    project = args.project or _pipeline_setting(
+        'shots', 'base_path', "/studio/projects")
+
+    def create(shot_name):
+        creator = ShotCreator(shot_name, project)
+        success = creator.create_shot_directory()
+        if success and args.maya_scene:
+            success = creator.setup_maya_scene()
+        return success
+
+    exit_code = 0
+    for shot_name, success in zip(args.shots, context.executor.map(create, args.shots)):
+        out.write(f"{'OK' if success else 'FAIL'} {shot_name}\n")
+        if not success:
+            exit_code = 1
+    return exit_code
+
+
+def _cmd_render(args, context: ToolContext, out: TextIO) -> int:
+    from studio_tools.rendering.arnold import ArnoldRenderer
+
+    renderer = ArnoldRenderer(args.project_name)
+    if not renderer.setup_render_layers(args.layers):
+        return 1
+    if args.samples is not None:
+        renderer.set_samples(args.samples)
+    out.write(f"{json.dumps(renderer.get_render_info(), indent=2)}\n")
+    return 0
+
+
+def _cmd_du(args, context: ToolContext, out: TextIO) -> int:
+    from studio_tools.shots.disk_usage import DiskUsageScanner, format_size
+
+    project = args.project or _pipeline_setting(
+        'shots', 'base_path', "/studio/projects")
+    scanner = DiskUsageScanner(project, max_workers=args.workers, cache_path=args.cache)
+    entries = scanner.scan()
+    if args.by == "shot":
+        rows = scanner.shot_totals(entries)
+    elif args.by == "folder":
+        rows = scanner.folder_totals(entries)
+    else:
+        rows = [(f"{e.shot}/{e.folder}", e.bytes) for e in entries]
+    for label, num_bytes in rows[:args.top]:
+        out.write(f"{format_size(num_bytes):>12}  {label}\n")
+    out.write(f"{format_size(sum(e.bytes for e in entries)):>12}  total\n")
+    return 0
+
+
+def _cmd_retention(args, context: ToolContext, out: TextIO) -> int:
+    from studio_tools.publishing.retention import RetentionEngine
+
+    archive = args.archive or _pipeline_setting(
+        'publishing', 'archive_path', "/studio/archive")
+    engine = RetentionEngine(archive, cold_storage_path=args.cold_storage)
+    actions = engine.plan()
+    if actions:
+        out.write(f"{engine.format_plan(actions)}\n")
+    if not args.apply:
+        out.write(f"Dry run: {len(actions)} actions planned\n")
+        return 0
+    result = engine.apply(actions, workers=args.workers, max_ops_per_second=args.rate)
+    out.write(f"Applied {result['applied']} actions, {result['failed']} failed\n")
+    return 1 if result['failed'] else 0
+
+
+COMMANDS = {
+    'check': _cmd_check,
+    'check-textures': _cmd_check_textures,
+    'publish': _cmd_publish,
+    'create-shots': _cmd_create_shots,
+    'render': _cmd_render,
+    'du': _cmd_du,
+    'retention': _cmd_retention,
+}
+
+
+def _resolve_paths(args: argparse.Namespace, cwd: str) -> None:
+    """Make relative path arguments absolute against the caller's directory.
+
+    Args:
+        args: Parsed arguments, updated in place
+        cwd: Working directory of the client that issued the command
+    """
+    for name in PATH_ARGUMENTS:
+        value = getattr(args, name, None)
+        if isinstance(value, list):
+            setattr(args, name, [os.path.join(cwd, v) for v in value])
+        elif value:
+            setattr(args, name, os.path.join(cwd, value))
+
+
+def run_command(argv: List[str], context: Optional[ToolContext] = None,
+                out: Optional[TextIO] = None, cwd: Optional[str] = None) -> int:
+    """Run a single command in-process.
+
+    Args:
+        argv: Command line arguments (without the program name)
+        context: Shared tool context (a temporary one is created if None)
+        out: Stream receiving command output (defaults to stdout)
+        cwd: Directory relative paths are resolved against (the daemon
+            passes the client's working directory)
+
+    Returns:
+        Process exit code
+    """
+    out = out or sys.stdout
+    try:
+        args = build_parser(out).parse_args(argv)
+    except CommandExit as e:
+        return e.status
+    if cwd is not None:
+        _resolve_paths(args, cwd)
+
+    handler = COMMANDS.get(args.command)
+    if handler is None:
+        out.write(f"Command not available here: {args.command}\n")
+        return 2
+
+    owns_context = context is None
+    if owns_context:
+        context = ToolContext()
+    try:
+        return handler(args, context, out)
+    except Exception as e:
+        logger.error(f"Error running command {args.command}: {e}")
+        out.write(f"Error: {e}\n")
+        return 1
+    finally:
+        if owns_context:
+            context.close()
+
+
+def _forward_socket(argv: List[str]) -> Optional[str]:
+    """Find the daemon socket a command should be forwarded to.
+
+    Only ``--socket`` ahead of the command and the environment are checked,
+    so the decision needs neither the argument parser nor any pipeline
+    module.
+
+    Args:
+        argv: Command line arguments (without the program name)
+
+    Returns:
+        Socket path, or None to run locally ("serve", help and usage errors
+        are always handled locally)
+    """
+    socket_path = os.environ.get(SOCKET_ENV_VAR)
+    index = 0
+    while index < len(argv):
+        if argv[index] == "--socket" and index + 1 < len(argv):
+            socket_path = argv[index + 1]
+            index += 2
+        elif argv[index].startswith("--socket="):
+            socket_path = argv[index].split("=", 1)[1]
+            index += 1
+        else:
+            break
+    if index == len(argv) or argv[index].startswith("-") or argv[index] == "serve":
+        return None
+    if not socket_path or not os.path.exists(socket_path):
+        return None
+    return socket_path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for the ``studio-tools`` console script.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    socket_path = _forward_socket(argv)
+    if socket_path is not None:
+        from studio_tools.cli.client import send_request
+
+        try:
+            exit_code, output = send_request(socket_path, argv)
+            sys.stdout.write(output)
+            return exit_code
+        except OSError as e:
+            logger.warning(f"Daemon unavailable at {socket_path}, running locally: {e}")
+
+    try:
+        args, _ = build_parser().parse_known_args(argv)
+    except CommandExit as e:
+        return e.status
+
+    if args.command == "serve":
+        if not args.socket:
+            sys.stderr.write(f"serve requires --socket or ${SOCKET_ENV_VAR}\n")
+            return 2
+        from studio_tools.cli import daemon
+
+        daemon.serve(args.socket, max_workers=args.workers)
+        return 0
+
+    return run_command(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
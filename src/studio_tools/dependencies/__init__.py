@@ -0,0 +1,15 @@
+"""
+Dependencies Sub-package
+
+Tools for tracking which shots, caches and renders use which asset versions.
+"""
+
+from .graph import DependencyGraph, asset_node, cache_node, render_node, shot_node
+
+__all__ = [
+    "DependencyGraph",
+    "asset_node",
+    "cache_node",
+    "render_node",
+    "shot_node"
+]
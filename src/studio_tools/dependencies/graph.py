@@ -0,0 +1,273 @@
+"""Dependency graph between published assets, shots, caches and renders.
+
+Edges point from an upstream node to the downstream node that uses it
+(asset version -> shot -> cache -> render). The graph is stored in SQLite
+with indexes on both edge directions, so "what uses this?" is as cheap as
+"what does this use?", and a changed asset version can be turned into the
+minimal, topologically ordered list of things to regenerate.
+"""
+
+import json
+import logging
+import sqlite3
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ASSET = "asset"
+SHOT = "shot"
+CACHE = "cache"
+RENDER = "render"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    attrs TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS edges (
+    upstream TEXT NOT NULL,
+    downstream TEXT NOT NULL,
+    PRIMARY KEY (upstream, downstream)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS edges_by_downstream ON edges (downstream, upstream);
+CREATE INDEX IF NOT EXISTS nodes_by_kind ON nodes (kind);
+"""
+
+
+def asset_node(asset_name: str, version: str) -> str:
+    """Node id for a published asset version (e.g. "asset:char_hero@v003")."""
+    return f"{ASSET}:{asset_name}@{version}"
+
+
+def shot_node(shot_name: str) -> str:
+    """Node id for a shot (e.g. "shot:SQ010_SH020")."""
+    return f"{SHOT}:{shot_name}"
+
+
+def cache_node(shot_name: str, cache_name: str) -> str:
+    """Node id for a shot cache (e.g. "cache:SQ010_SH020/hero_anim")."""
+    return f"{CACHE}:{shot_name}/{cache_name}"
+
+
+def render_node(shot_name: str, layer: str) -> str:
+    """Node id for a render layer of a shot (e.g. "render:SQ010_SH020/beauty")."""
+    return f"{RENDER}:{shot_name}/{layer}"
+
+
+class DependencyGraph:
+    """SQLite-backed dependency graph with fast reverse lookups."""
+
+    def __init__(self, db_path: str = ":memory:"):
+        """Initialize dependency graph.
+
+        Args:
+            db_path: SQLite database file (":memory:" for a transient graph)
+        """
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(_SCHEMA)
+        logger.info(f"DependencyGraph opened: {db_path}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def add_node(self, node_id: str, kind: Optional[str] = None, **attrs) -> None:
+        """Add or update a node.
+
+        Args:
+            node_id: Node id (see asset_node, shot_node, cache_node, render_node)
+            kind: Node kind (defaults to the id prefix)
+            **attrs: JSON-serializable attributes (e.g. frames=[1001, 1100])
+        """
+        kind = kind or node_id.split(":", 1)[0]
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO nodes (id, kind, attrs) VALUES (?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET kind = excluded.kind, attrs = excluded.attrs",
+                (node_id, kind, json.dumps(attrs)))
+
+    def add_dependencies(self, pairs: Iterable[Tuple[str, str]]) -> None:
+        """Add edges in bulk, creating missing nodes.
+
+        Args:
+            pairs: (upstream, downstream) node id pairs
+        """
+        pairs = list(pairs)
+        nodes = {node for pair in pairs for node in pair}
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO nodes (id, kind) VALUES (?, ?)",
+                [(node, node.split(":", 1)[0]) for node in nodes])
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO edges (upstream, downstream) VALUES (?, ?)", pairs)
+
+    def add_dependency(self, upstream: str, downstream: str) -> None:
+        """Record that downstream uses upstream.
+
+        Args:
+            upstream: Node being used (e.g. an asset version)
+            downstream: Node using it (e.g. a shot)
+        """
+        self.add_dependencies([(upstream, downstream)])
+
+    def remove_dependency(self, upstream: str, downstream: str) -> None:
+        """Remove a single edge.
+
+        Args:
+            upstream: Upstream node id
+            downstream: Downstream node id
+        """
+        with self._conn:
+            self._conn.execute("DELETE FROM edges WHERE upstream = ? AND downstream = ?",
+                               (upstream, downstream))
+
+    def get_node(self, node_id: str) -> Optional[Dict]:
+        """Get a node's kind and attributes.
+
+        Args:
+            node_id: Node id
+
+        Returns:
+            Dictionary with id, kind and attrs, or None if unknown
+        """
+        row = self._conn.execute("SELECT id, kind, attrs FROM nodes WHERE id = ?",
+                                 (node_id,)).fetchone()
+        if row is None:
+            return None
+        return {'id': row[0], 'kind': row[1], 'attrs': json.loads(row[2])}
+
+    def dependents(self, node_id: str) -> List[str]:
+        """Get nodes that directly use a node.
+
+        Args:
+            node_id: Upstream node id
+
+        Returns:
+            Sorted downstream node ids
+        """
+        rows = self._conn.execute(
+            "SELECT downstream FROM edges WHERE upstream = ? ORDER BY downstream", (node_id,))
+        return [row[0] for row in rows]
+
+    def dependencies(self, node_id: str) -> List[str]:
+        """Get nodes that a node directly uses.
+
+        Args:
+            node_id: Downstream node id
+
+        Returns:
+            Sorted upstream node ids
+        """
+        rows = self._conn.execute(
+            "SELECT upstream FROM edges WHERE downstream = ? ORDER BY upstream", (node_id,))
+        return [row[0] for row in rows]
+
+    def affected(self, changed: Iterable[str]) -> List[str]:
+        """Get everything downstream of the changed nodes in build order.
+
+        Args:
+            changed: Node ids that changed
+
+        Returns:
+            Affected node ids (excluding the changed nodes) in topological order
+
+        Raises:
+            ValueError: If the affected subgraph contains a cycle
+        """
+        changed = list(changed)
+        if not changed:
+            return []
+
+        placeholders = ", ".join("?" for _ in changed)
+        edges = self._conn.execute(f"""
+            WITH RECURSIVE reach(id) AS (
+                SELECT id FROM nodes WHERE id IN ({placeholders})
+                UNION
+                SELECT e.downstream FROM edges e JOIN reach r ON e.upstream = r.id
+            )
+            SELECT e.upstream, e.downstream FROM edges e
+            WHERE e.upstream IN reach
+        """, changed).fetchall()
+
+        # Kahn's algorithm over the reachable subgraph
+        indegree: Dict[str, int] = {}
+        children: Dict[str, List[str]] = {}
+        for upstream, downstream in edges:
+            children.setdefault(upstream, []).append(downstream)
+            indegree[downstream] = indegree.get(downstream, 0) + 1
+            indegree.setdefault(upstream, 0)
+
+        queue = deque(sorted(node for node, degree in indegree.items() if degree == 0))
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for child in sorted(children.get(node, [])):
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    queue.append(child)
+
+        if len(order) != len(indegree):
+            raise ValueError("Dependency cycle detected downstream of: " + ", ".join(changed))
+
+        changed_set = set(changed)
+        return [node for node in order if node not in changed_set]
+
+    def rebuild_plan(self, changed: Iterable[str],
+                     kinds: Iterable[str] = (CACHE, RENDER)) -> List[Dict]:
+        """Get the caches and renders to regenerate after a change.
+
+        Args:
+            changed: Node ids that changed (e.g. a republished asset version)
+            kinds: Node kinds that need regenerating
+
+        Returns:
+            Node dictionaries (id, kind, attrs) in build order
+        """
+        kinds = set(kinds)
+        plan = []
+        for node_id in self.affected(changed):
+            node = self.get_node(node_id)
+            if node['kind'] in kinds:
+                plan.append(node)
+        return plan
+
+    def register_publish(self, record: Dict) -> str:
+        """Add a node for an AssetPublisher publish record.
+
+        Args:
+            record: Entry from AssetPublisher.get_published_assets()
+
+        Returns:
+            Asset version node id
+        """
+        node_id = asset_node(record['name'], record['version'])
+        self.add_node(node_id, ASSET, path=record.get('path'),
+                      published_at=record.get('published_at'))
+        return node_id
+
+    def register_render(self, shot_name: str, layers: Iterable[str],
+                        frames: Optional[Tuple[int, int]] = None,
+                        inputs: Iterable[str] = ()) -> List[str]:
+        """Add render layer nodes for a shot.
+
+        Args:
+            shot_name: Shot the render belongs to
+            layers: Render layer names (e.g. ArnoldRenderer.render_layers)
+            frames: Optional (first, last) frame range
+            inputs: Upstream nodes the render uses (defaults to the shot)
+
+        Returns:
+            Render node ids
+        """
+        inputs = list(inputs) or [shot_node(shot_name)]
+        node_ids = []
+        for layer in layers:
+            node_id = render_node(shot_name, layer)
+            self.add_node(node_id, RENDER, frames=list(frames) if frames else None)
+            node_ids.append(node_id)
+        self.add_dependencies((upstream, node_id) for node_id in node_ids for upstream in inputs)
+        return node_ids
@@ -0,0 +1,16 @@
+"""
+Filesystem Sub-package
+
+Shared file-system helpers used by the other tool sub-packages.
+"""
+
+from .cache import MetadataCache, SharedStatTable, get_default_cache
+from .journal import ChangeEvent, ChangeJournal
+
+__all__ = [
+    "ChangeEvent",
+    "ChangeJournal",
+    "MetadataCache",
+    "SharedStatTable",
+    "get_default_cache"
+]
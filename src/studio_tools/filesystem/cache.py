@@ -0,0 +1,421 @@
+"""File-system metadata cache for studio pipeline tools.
+
+Importer, checker, publisher and shot tools repeatedly ask the same
+questions (does it exist, is it a directory, what is in it) about the same
+paths. On network storage every one of those is a server round-trip, so
+answers are cached here for a short TTL and invalidated explicitly whenever
+the tools themselves write to disk. Paths that do not exist are never cached,
+so a file that appears after a check is seen by the next one.
+
+Stat results can optionally be mirrored into a SharedStatTable, a fixed-size
+memory-mapped hash table that every worker process on a node can read.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+DEFAULT_TTL = 2.0
+SHARED_CACHE_ENV_VAR = "STUDIO_TOOLS_FS_CACHE"
+
+
+class FileMetadata(NamedTuple):
+    """Cached subset of a stat() result."""
+
+    exists: bool
+    is_dir: bool
+    is_file: bool
+    size: int
+    mtime: float
+    mode: int
+
+
+MISSING = FileMetadata(False, False, False, 0, 0.0, 0)
+
+
+def _stat_path(path: str) -> FileMetadata:
+    """Stat a path without following the cache.
+
+    Args:
+        path: Absolute path to stat
+
+    Returns:
+        FileMetadata for the path (MISSING if it does not exist)
+    """
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return MISSING
+    mode = st.st_mode
+    return FileMetadata(True, (mode & 0o170000) == 0o040000,
+                        (mode & 0o170000) == 0o100000,
+                        st.st_size, st.st_mtime, mode)
+
+
+class SharedStatTable:
+    """Memory-mapped stat table shared by all processes on a node.
+
+    The table is a fixed number of slots addressed by a 64-bit hash of the
+    path with short linear probing; colliding entries simply overwrite each
+    other, which only costs a cache miss. Writers hold an exclusive flock
+    and clear the trailing check field while a slot is being rewritten, so
+    readers never need a lock and treat half-written slots as misses.
+    Recursive invalidation bumps a generation counter in the header, which
+    expires every existing slot at once.
+    """
+
+    MAGIC = b"STFC"
+    HEADER = struct.Struct("<4sIQ")       # magic, slot count, generation
+    SLOT = struct.Struct("<QQdqdIIQ")     # key, generation, expires, size, mtime, mode, flags, check
+    PROBES = 8
+
+    def __init__(self, path: PathLike, slots: int = 65536):
+        """Open or create a shared stat table.
+
+        Args:
+            path: Backing file (use /dev/shm on Linux for a pure shared-memory table)
+            slots: Number of slots when creating a new table
+        """
+        self.path = Path(path)
+        self._fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o666)
+        self._lock()
+        try:
+            if os.fstat(self._fd).st_size < self.HEADER.size:
+                size = self.HEADER.size + slots * self.SLOT.size
+                os.ftruncate(self._fd, size)
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                os.write(self._fd, self.HEADER.pack(self.MAGIC, slots, 1))
+        finally:
+            self._unlock()
+
+        self._mm = mmap.mmap(self._fd, 0)
+        magic, self.slots, _ = self.HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"Not a shared stat table: {self.path}")
+        logger.info(f"SharedStatTable opened: {self.path} ({self.slots} slots)")
+
+    def _lock(self):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def _unlock(self):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        digest = hashlib.blake2b(key.encode('utf-8', 'surrogateescape'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') or 1
+
+    def _generation(self) -> int:
+        return self.HEADER.unpack_from(self._mm, 0)[2]
+
+    def _offsets(self, h: int):
+        start = h % self.slots
+        for i in range(self.PROBES):
+            yield self.HEADER.size + ((start + i) % self.slots) * self.SLOT.size
+
+    def get(self, key: str) -> Optional[FileMetadata]:
+        """Look up a cached entry.
+
+        Args:
+            key: Absolute path
+
+        Returns:
+            FileMetadata if a fresh entry exists, None otherwise
+        """
+        h = self._hash(key)
+        generation = self._generation()
+        now = time.time()
+        for offset in self._offsets(h):
+            slot_key, gen, expires, size, mtime, mode, flags, check = \
+                self.SLOT.unpack(self._mm[offset:offset + self.SLOT.size])
+            if slot_key == h and check == h:
+                if gen != generation or expires < now:
+                    return None
+                return FileMetadata(bool(flags & 1), bool(flags & 2), bool(flags & 4),
+                                    size, mtime, mode)
+        return None
+
+    def put(self, key: str, meta: FileMetadata, ttl: float) -> None:
+        """Store an entry.
+
+        Args:
+            key: Absolute path
+            meta: Metadata to store
+            ttl: Time to live in seconds
+        """
+        h = self._hash(key)
+        flags = int(meta.exists) | int(meta.is_dir) << 1 | int(meta.is_file) << 2
+        self._lock()
+        try:
+            target = None
+            for offset in self._offsets(h):
+                slot_key, gen, expires, *_ = self.SLOT.unpack_from(self._mm, offset)
+                if slot_key == h:
+                    target = offset
+                    break
+                if target is None and (slot_key == 0 or expires < time.time()):
+                    target = offset
+            if target is None:
+                target = next(self._offsets(h))
+            check_offset = target + self.SLOT.size - 8
+            self._mm[check_offset:check_offset + 8] = bytes(8)
+            self._mm[target:target + self.SLOT.size] = self.SLOT.pack(
+                h, self._generation(), time.time() + ttl, meta.size, meta.mtime,
+                meta.mode, flags, 0)
+            self._mm[check_offset:check_offset + 8] = h.to_bytes(8, 'little')
+        finally:
+            self._unlock()
+
+    def invalidate(self, key: str) -> None:
+        """Drop a single entry.
+
+        Args:
+            key: Absolute path
+        """
+        h = self._hash(key)
+        self._lock()
+        try:
+            for offset in self._offsets(h):
+                if self.SLOT.unpack_from(self._mm, offset)[0] == h:
+                    check_offset = offset + self.SLOT.size - 8
+                    self._mm[check_offset:check_offset + 8] = bytes(8)
+        finally:
+            self._unlock()
+
+    def invalidate_all(self) -> None:
+        """Expire every entry by bumping the table generation."""
+        self._lock()
+        try:
+            magic, slots, generation = self.HEADER.unpack_from(self._mm, 0)
+            self.HEADER.pack_into(self._mm, 0, magic, slots, generation + 1)
+        finally:
+            self._unlock()
+
+    def close(self) -> None:
+        """Unmap the table and close the backing file."""
+        self._mm.close()
+        os.close(self._fd)
+
+
+class MetadataCache:
+    """TTL cache for path metadata and directory listings."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = 100000,
+                 shared_table: Optional[SharedStatTable] = None):
+        """Initialize metadata cache.
+
+        Args:
+            ttl: Seconds a cached answer stays valid
+            max_entries: Soft limit on locally cached paths
+            shared_table: Optional node-wide table mirroring stat results
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.shared_table = shared_table
+        self._entries: Dict[str, Tuple[float, FileMetadata]] = {}
+        self._listings: Dict[str, Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+
+    @staticmethod
+    def _key(path: PathLike) -> str:
+        return os.path.abspath(os.fspath(path))
+
+    def _prune(self, now: float) -> None:
+        """Drop expired entries once the soft size limit is reached."""
+        if len(self._entries) + len(self._listings) < self.max_entries:
+            return
+        for table in (self._entries, self._listings):
+            for key in [k for k, (expires, _) in table.items() if expires < now]:
+                del table[key]
+        if len(self._entries) + len(self._listings) >= self.max_entries:
+            self._entries.clear()
+            self._listings.clear()
+
+    def stat(self, path: PathLike) -> FileMetadata:
+        """Get metadata for a path.
+
+        Args:
+            path: Path to look up
+
+        Returns:
+            FileMetadata (MISSING if the path does not exist; missing paths
+            are not cached)
+        """
+        key = self._key(path)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] >= now:
+                self.hits += 1
+                return cached[1]
+
+        meta = self.shared_table.get(key) if self.shared_table is not None else None
+        with self._lock:
+            if meta is not None:
+                self.shared_hits += 1
+            else:
+                self.misses += 1
+        if meta is None:
+            meta = _stat_path(key)
+            if not meta.exists:
+                return meta
+            if self.shared_table is not None:
+                self.shared_table.put(key, meta, self.ttl)
+
+        with self._lock:
+            self._prune(now)
+            self._entries[key] = (now + self.ttl, meta)
+        return meta
+
+    def exists(self, path: PathLike) -> bool:
+        """Check whether a path exists."""
+        return self.stat(path).exists
+
+    def is_dir(self, path: PathLike) -> bool:
+        """Check whether a path is a directory."""
+        return self.stat(path).is_dir
+
+    def is_file(self, path: PathLike) -> bool:
+        """Check whether a path is a regular file."""
+        return self.stat(path).is_file
+
+    def listdir(self, path: PathLike) -> List[str]:
+        """List entry names in a directory.
+
+        Args:
+            path: Directory to list
+
+        Returns:
+            Sorted entry names (empty if the directory does not exist)
+        """
+        key = self._key(path)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is not None and cached[0] >= now:
+                self.hits += 1
+                return list(cached[1])
+            self.misses += 1
+
+        try:
+            names = sorted(os.listdir(key))
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+        with self._lock:
+            self._prune(now)
+            self._listings[key] = (now + self.ttl, names)
+        return list(names)
+
+    def iterdir(self, path: PathLike) -> List[Path]:
+        """List directory entries as paths.
+
+        Args:
+            path: Directory to list
+
+        Returns:
+            List of child paths
+        """
+        base = Path(path)
+        return [base / name for name in self.listdir(path)]
+
+    def invalidate(self, path: PathLike, recursive: bool = False) -> None:
+        """Forget cached answers after a path was written.
+
+        The parent's metadata and listing are dropped as well, since creating
+        or removing an entry changes both.
+
+        Args:
+            path: Path that was created, modified or removed
+            recursive: Also drop everything below the path
+        """
+        key = self._key(path)
+        parent = os.path.dirname(key)
+        with self._lock:
+            for k in (key, parent):
+                self._entries.pop(k, None)
+                self._listings.pop(k, None)
+            if recursive:
+                prefix = key.rstrip(os.sep) + os.sep
+                for table in (self._entries, self._listings):
+                    for k in [k for k in table if k.startswith(prefix)]:
+                        del table[k]
+
+        if self.shared_table is not None:
+            if recursive:
+                self.shared_table.invalidate_all()
+            else:
+                self.shared_table.invalidate(key)
+                self.shared_table.invalidate(parent)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self._listings.clear()
+        if self.shared_table is not None:
+            self.shared_table.invalidate_all()
+
+    def get_stats(self) -> dict:
+        """Get cache hit/miss statistics.
+
+        Returns:
+            Dictionary of counters and the local hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'listings': len(self._listings),
+            }
+
+
+_default_cache: Optional[MetadataCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> MetadataCache:
+    """Get the process-wide metadata cache shared by all tools.
+
+    If the ``STUDIO_TOOLS_FS_CACHE`` environment variable names a file, the
+    cache is backed by a SharedStatTable at that location.
+
+    Returns:
+        Shared MetadataCache instance
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            shared_table = None
+            shared_path = os.environ.get(SHARED_CACHE_ENV_VAR)
+            if shared_path:
+                try:
+                    shared_table = SharedStatTable(shared_path)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Shared stat table unavailable at {shared_path}: {e}")
+            _default_cache = MetadataCache(shared_table=shared_table)
+        return _default_cache
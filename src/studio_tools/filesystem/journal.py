@@ -0,0 +1,596 @@
+"""Incremental file-system change journal for studio pipeline tools.
+
+Records creates, modifies and deletes under the asset, archive and shot
+roots so downstream tools can process only what changed since their last
+run instead of walking the whole tree.
+
+Changes are detected either live with inotify (Linux) or by diffing a
+scandir walk against the previous snapshot. Both append to the same
+journal, and each consumer keeps its own persisted cursor into it.
+
+State directory layout:
+    snapshot.json  - path -> [mtime_ns, size, is_dir] from the last scan
+    journal.jsonl  - one ChangeEvent per line, in sequence order
+    cursors.json   - consumer -> last processed sequence number and offset
+    journal.lock   - flock held while any of the above is changed
+
+Several processes may share one state directory, including concurrent
+scan() and watch() callers; every read-modify-write of the journal,
+snapshot or cursors happens under the lock, against the files on disk.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from studio_tools.filesystem.cache import MetadataCache, get_default_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+CREATED = "created"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+# inotify constants (from <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class ChangeEvent(NamedTuple):
+    """A single recorded file-system change."""
+
+    seq: int
+    kind: str
+    path: str
+    is_dir: bool
+    timestamp: float
+
+
+def _scan_tree(root: str) -> Dict[str, list]:
+    """Walk a directory tree with scandir.
+
+    Args:
+        root: Directory to walk
+
+    Returns:
+        Mapping of path -> [mtime_ns, size, is_dir] for everything below root
+    """
+    entries = {}
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                    entries[entry.path] = [st.st_mtime_ns, st.st_size, is_dir]
+                    if is_dir:
+                        stack.append(entry.path)
+        except (FileNotFoundError, NotADirectoryError, PermissionError) as e:
+            logger.debug(f"Skipping unreadable directory {current}: {e}")
+    return entries
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    """Write JSON to a temporary file and rename it into place."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(str(tmp_path), str(path))
+
+
+def _inotify_available() -> bool:
+    return sys.platform.startswith('linux') and bool(ctypes.util.find_library('c'))
+
+
+class _InotifyWatcher:
+    """Minimal recursive inotify watcher built on ctypes."""
+
+    def __init__(self, roots: Iterable[str]):
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths: Dict[int, str] = {}
+        for root in roots:
+            self.add_tree(root)
+
+    def add_tree(self, root: str) -> List[str]:
+        """Watch a directory and everything below it.
+
+        Returns:
+            Paths found below the directory while adding watches
+        """
+        found = []
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(current), WATCH_MASK)
+            if wd < 0:
+                continue
+            self._paths[wd] = current
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        found.append(entry.path)
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError:
+                pass
+        return found
+
+    def read(self, timeout: Optional[float]) -> List[Tuple[int, str]]:
+        """Read pending events.
+
+        Args:
+            timeout: Seconds to wait for events (None = block)
+
+        Returns:
+            List of (mask, path) tuples; a mask of IN_Q_OVERFLOW means events were lost
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        data = os.read(self.fd, 1024 * 1024)
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                events.append((IN_Q_OVERFLOW, ""))
+                continue
+            if mask & IN_IGNORED:
+                self._paths.pop(wd, None)
+                continue
+            directory = self._paths.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            events.append((mask, path))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class ChangeJournal:
+    """Persistent journal of changes below a set of root directories."""
+
+    def __init__(self, roots: Iterable[PathLike], state_dir: PathLike,
+                 fs_cache: Optional[MetadataCache] = None):
+        """Initialize change journal.
+
+        Args:
+            roots: Directories to track
+            state_dir: Directory holding the snapshot, journal and cursors
+            fs_cache: Metadata cache invalidated for every recorded change
+                (defaults to the shared process cache)
+        """
+        self.roots = [os.path.abspath(os.fspath(root)) for root in roots]
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.fs_cache = fs_cache or get_default_cache()
+        self._snapshot_file = self.state_dir / "snapshot.json"
+        self._journal_file = self.state_dir / "journal.jsonl"
+        self._cursors_file = self.state_dir / "cursors.json"
+        self._lock_fd = os.open(str(self.state_dir / "journal.lock"), os.O_RDWR | os.O_CREAT, 0o666)
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+        self._snapshot: Optional[Dict[str, list]] = None
+        self._snapshot_stamp = None
+        logger.info(f"ChangeJournal initialized for: {', '.join(self.roots)}")
+
+    @classmethod
+    def from_config(cls, state_dir: PathLike, **kwargs) -> "ChangeJournal":
+        """Create a journal for the roots configured in pipeline.yaml.
+
+        Tracks ``assets.base_path``, ``publishing.archive_path`` and
+        ``shots.base_path``.
+
+        Args:
+            state_dir: Directory holding the journal state
+
+        Returns:
+            ChangeJournal instance
+        """
+        from studio_tools.config import PIPELINE_CONFIG
+
+        pipeline = PIPELINE_CONFIG.get('pipeline', {}) or {}
+        roots = [
+            pipeline.get('assets', {}).get('base_path', "/studio/assets"),
+            pipeline.get('publishing', {}).get('archive_path', "/studio/archive"),
+            pipeline.get('shots', {}).get('base_path', "/studio/shots"),
+        ]
+        return cls(roots, state_dir, **kwargs)
+
+    def close(self) -> None:
+        """Release the state directory lock file."""
+        os.close(self._lock_fd)
+
+    @contextmanager
+    def _locked(self):
+        """Hold the state directory lock (re-entrant within this instance)."""
+        with self._thread_lock:
+            if self._lock_depth == 0 and fcntl is not None:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and fcntl is not None:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _read_last_seq(self) -> int:
+        """Find the sequence number of the last journal entry.
+
+        Consumer cursors are taken into account too, so numbering keeps
+        increasing after compaction empties the journal.
+        """
+        last_committed = max((c['seq'] for c in self._load_cursors().values()), default=0)
+        if not self._journal_file.exists():
+            return last_committed
+        with open(self._journal_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 4096))
+            lines = f.read().splitlines()
+        for line in reversed(lines):
+            try:
+                return max(json.loads(line.decode('utf-8'))[0], last_committed)
+            except (ValueError, IndexError):
+                continue
+        return last_committed
+
+    def _snapshot_file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(str(self._snapshot_file))
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _load_snapshot(self) -> Dict[str, list]:
+        """Get the snapshot, re-reading it if another instance replaced the file.
+
+        Callers that modify the snapshot must hold the lock.
+        """
+        stamp = self._snapshot_file_stamp()
+        if self._snapshot is None or stamp != self._snapshot_stamp:
+            if stamp is not None:
+                with open(self._snapshot_file, 'r') as f:
+                    self._snapshot = json.load(f)
+            else:
+                self._snapshot = {}
+            self._snapshot_stamp = stamp
+        return self._snapshot
+
+    def _save_snapshot(self) -> None:
+        _write_json_atomic(self._snapshot_file, self._load_snapshot())
+        self._snapshot_stamp = self._snapshot_file_stamp()
+
+    def _append(self, changes: List[Tuple[str, str, bool]]) -> List[ChangeEvent]:
+        """Append changes to the journal.
+
+        Args:
+            changes: List of (kind, path, is_dir) tuples
+
+        Returns:
+            Recorded events
+        """
+        if not changes:
+            return []
+        now = time.time()
+        events = []
+        with self._locked():
+            # Other instances may have appended since; never trust a cached counter
+            last_seq = self._read_last_seq()
+            for kind, path, is_dir in changes:
+                last_seq += 1
+                events.append(ChangeEvent(last_seq, kind, path, is_dir, now))
+            with open(self._journal_file, 'a') as f:
+                f.write("".join(json.dumps(list(event)) + "\n" for event in events))
+                f.flush()
+                os.fsync(f.fileno())
+        for event in events:
+            self.fs_cache.invalidate(event.path)
+        return events
+
+    def scan(self) -> List[ChangeEvent]:
+        """Diff the roots against the last snapshot and record changes.
+
+        The first scan records every existing entry as created. The snapshot
+        is re-read from disk under the lock, so scans from several instances
+        sharing the state directory never record the same change twice.
+
+        Returns:
+            Newly recorded events
+        """
+        with self._locked():
+            old = self._load_snapshot()
+            new = {}
+            for root in self.roots:
+                new.update(_scan_tree(root))
+
+            changes = []
+            for path, info in new.items():
+                previous = old.get(path)
+                if previous is None:
+                    changes.append((CREATED, path, info[2]))
+                elif not info[2] and previous[:2] != info[:2]:
+                    changes.append((MODIFIED, path, False))
+            for path, info in old.items():
+                if path not in new:
+                    changes.append((DELETED, path, info[2]))
+
+            events = self._append(changes)
+            self._snapshot = new
+            self._save_snapshot()
+        logger.info(f"ChangeJournal scan recorded {len(events)} changes")
+        return events
+
+    def _stat_entry(self, path: str) -> Optional[list]:
+        try:
+            st = os.stat(path, follow_symlinks=False)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size, os.path.isdir(path)]
+
+    def _record(self, observed: List[Tuple[int, str]],
+                watcher: _InotifyWatcher) -> List[ChangeEvent]:
+        """Apply inotify events to the snapshot and journal the resulting changes.
+
+        Runs under the lock against the snapshot on disk, so changes that a
+        concurrent scan() or watcher has already recorded are not recorded
+        again.
+
+        Args:
+            observed: (mask, path) tuples from the watcher
+            watcher: Watcher to add newly created directories to
+
+        Returns:
+            Recorded events
+        """
+        if not observed:
+            return []
+        with self._locked():
+            snapshot = self._load_snapshot()
+            changes = []
+            for mask, path in observed:
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    if mask & IN_ISDIR:
+                        # A moved-away directory takes its whole subtree with it
+                        prefix = path + os.sep
+                        removed = [p for p in snapshot if p == path or p.startswith(prefix)]
+                    else:
+                        removed = [path] if path in snapshot else []
+                    for p in removed:
+                        changes.append((DELETED, p, snapshot.pop(p)[2]))
+                    continue
+                info = self._stat_entry(path)
+                if info is None:
+                    continue
+                kind = MODIFIED if path in snapshot else CREATED
+                if kind == MODIFIED and (info[2] or snapshot[path][:2] == info[:2]):
+                    continue
+                snapshot[path] = info
+                changes.append((kind, path, info[2]))
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    for child in watcher.add_tree(path):
+                        child_info = self._stat_entry(child)
+                        if child_info is not None and child not in snapshot:
+                            snapshot[child] = child_info
+                            changes.append((CREATED, child, child_info[2]))
+            events = self._append(changes)
+            if changes:
+                self._save_snapshot()
+        return events
+
+    def watch(self, duration: Optional[float] = None, poll_interval: float = 1.0) -> int:
+        """Record changes live until the duration elapses or on interrupt.
+
+        Uses inotify where available and falls back to periodic scans
+        otherwise. A scan is run first so nothing between runs is missed.
+
+        Args:
+            duration: Seconds to watch (None = until KeyboardInterrupt)
+            poll_interval: Seconds between scans in fallback mode
+
+        Returns:
+            Number of events recorded
+        """
+        recorded = len(self.scan())
+        deadline = None if duration is None else time.monotonic() + duration
+
+        def remaining():
+            if deadline is None:
+                return poll_interval
+            return max(0.0, min(poll_interval, deadline - time.monotonic()))
+
+        watcher = None
+        if _inotify_available():
+            try:
+                watcher = _InotifyWatcher([r for r in self.roots if os.path.isdir(r)])
+            except OSError as e:
+                logger.warning(f"inotify unavailable, falling back to scans: {e}")
+
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                if watcher is None:
+                    time.sleep(remaining())
+                    recorded += len(self.scan())
+                    continue
+
+                observed = []
+                for mask, path in watcher.read(remaining()):
+                    if mask == IN_Q_OVERFLOW:
+                        recorded += len(self._record(observed, watcher)) + len(self.scan())
+                        observed = []
+                    else:
+                        observed.append((mask, path))
+                recorded += len(self._record(observed, watcher))
+        except KeyboardInterrupt:
+            logger.info("ChangeJournal watch interrupted")
+        finally:
+            if watcher is not None:
+                watcher.close()
+        return recorded
+
+    def _load_cursors(self) -> Dict[str, dict]:
+        if not self._cursors_file.exists():
+            return {}
+        with open(self._cursors_file, 'r') as f:
+            return json.load(f)
+
+    def get_cursor(self, consumer: str) -> int:
+        """Get the last sequence number processed by a consumer.
+
+        Args:
+            consumer: Consumer name (e.g. "asset_checker")
+
+        Returns:
+            Sequence number (0 if the consumer has never run)
+        """
+        return self._load_cursors().get(consumer, {}).get('seq', 0)
+
+    def _start_offset(self, f, cursor: dict) -> int:
+        """Find where to start reading for a cursor.
+
+        Stored offsets go stale after compaction, in which case reading
+        restarts from the beginning of the journal.
+        """
+        offset = cursor.get('offset', 0)
+        f.seek(offset)
+        first = f.readline()
+        if offset and (not first.endswith(b"\n")
+                       or json.loads(first.decode('utf-8'))[0] != cursor['seq'] + 1):
+            offset = 0
+        f.seek(offset)
+        return offset
+
+    def read_changes(self, consumer: str) -> List[ChangeEvent]:
+        """Read events recorded since the consumer's last commit.
+
+        The journal is read under the lock, so an append in progress is
+        never seen half-written; a line without its trailing newline is
+        ignored all the same in case a writer could not take the lock.
+
+        Args:
+            consumer: Consumer name
+
+        Returns:
+            Events in sequence order
+        """
+        with self._locked():
+            if not self._journal_file.exists():
+                return []
+            cursor = self._load_cursors().get(consumer, {'seq': 0, 'offset': 0})
+            events = []
+            with open(self._journal_file, 'rb') as f:
+                self._start_offset(f, cursor)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    event = ChangeEvent(*json.loads(line.decode('utf-8')))
+                    if event.seq > cursor['seq']:
+                        events.append(event)
+        return events
+
+    def commit(self, consumer: str, seq: int) -> None:
+        """Persist a consumer's cursor.
+
+        Args:
+            consumer: Consumer name
+            seq: Sequence number of the last processed event
+        """
+        with self._locked():
+            cursors = self._load_cursors()
+            cursor = cursors.get(consumer, {'seq': 0, 'offset': 0})
+            if seq < cursor['seq']:
+                cursor = {'seq': 0, 'offset': 0}
+            offset = 0
+            if self._journal_file.exists():
+                with open(self._journal_file, 'rb') as f:
+                    offset = self._start_offset(f, cursor)
+                    for line in f:
+                        if json.loads(line.decode('utf-8'))[0] > seq:
+                            break
+                        offset += len(line)
+            cursors[consumer] = {'seq': seq, 'offset': offset}
+            _write_json_atomic(self._cursors_file, cursors)
+
+    def consume(self, consumer: str) -> List[ChangeEvent]:
+        """Read pending events and advance the consumer's cursor.
+
+        Args:
+            consumer: Consumer name
+
+        Returns:
+            Events recorded since the consumer's last run
+        """
+        events = self.read_changes(consumer)
+        if events:
+            self.commit(consumer, events[-1].seq)
+        return events
+
+    def compact(self) -> int:
+        """Drop events that every known consumer has already processed.
+
+        Returns:
+            Number of events removed
+        """
+        with self._locked():
+            cursors = self._load_cursors()
+            if not cursors or not self._journal_file.exists():
+                return 0
+            low = min(c['seq'] for c in cursors.values())
+            kept = []
+            removed = 0
+            with open(self._journal_file, 'rb') as f:
+                for line in f:
+                    if json.loads(line.decode('utf-8'))[0] > low:
+                        kept.append(line)
+                    else:
+                        removed += 1
+            tmp_path = self._journal_file.with_name(self._journal_file.name + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.writelines(kept)
+            os.replace(str(tmp_path), str(self._journal_file))
+            for cursor in cursors.values():
+                cursor['offset'] = 0
+            _write_json_atomic(self._cursors_file, cursors)
+        return removed
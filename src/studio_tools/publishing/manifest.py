@@ -0,0 +1,423 @@
+"""Memory-mapped manifest of published asset versions.
+
+Published version metadata is stored on disk as immutable, sorted segment
+files of fixed-width binary records. Readers mmap the segments and
+binary-search them directly, so opening the manifest costs nothing
+regardless of how many versions it holds. Every append writes a new
+segment to a temporary file and links it into place, so readers only ever
+see complete segments. Merges take an flock on ``manifest.lock`` so that
+processes sharing the directory never merge the same segments twice. Once there are too many segments, appends merge
+only the newest run of similarly sized segments (size-tiered, so every
+record is rewritten O(log n) times); compact() merges everything on demand.
+
+Segment layout (little-endian):
+    header   magic "STMN", format version, record size, record count, heap offset
+    records  name (64 bytes, NUL padded), version, path length, path offset,
+             timestamp, sha256 checksum -- sorted by (name, version)
+    heap     UTF-8 encoded paths referenced by the records
+
+Asset names are stored inline, so they are limited to NAME_SIZE (64) bytes
+of UTF-8; check_name() rejects longer names before anything is written.
+"""
+
+import hashlib
+import heapq
+import logging
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+MAGIC = b"STMN"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHQQ")
+RECORD = struct.Struct("<64sIIQd32s")
+NAME_SIZE = 64
+SEGMENT_GLOB = "segment-*.stm"
+
+
+class ManifestEntry(NamedTuple):
+    """Metadata for one published asset version."""
+
+    name: str
+    version: int
+    path: str
+    timestamp: float
+    checksum: str = ""
+
+
+def file_checksum(path: PathLike, chunk_size: int = 1024 * 1024) -> str:
+    """Compute the sha256 checksum of a file.
+
+    Args:
+        path: File to hash
+        chunk_size: Bytes read per iteration
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _segment_seq(path: Path) -> int:
+    return int(path.stem.split('-')[1])
+
+
+def check_name(name: str) -> bytes:
+    """Check that an asset name can be stored in the manifest.
+
+    Args:
+        name: Asset name
+
+    Returns:
+        UTF-8 encoded name
+
+    Raises:
+        ValueError: If the name is longer than NAME_SIZE bytes or contains NUL
+    """
+    encoded = name.encode('utf-8')
+    if len(encoded) > NAME_SIZE or b"\0" in encoded:
+        raise ValueError(f"Asset name not storable in manifest "
+                         f"(max {NAME_SIZE} UTF-8 bytes): {name!r}")
+    return encoded
+
+
+def _encode_name(name: str) -> bytes:
+    return check_name(name).ljust(NAME_SIZE, b"\0")
+
+
+class _Segment:
+    """Read-only view of one mmapped segment file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.inode = os.fstat(f.fileno()).st_ino
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, self.count, self.heap_offset = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD.size:
+            self._mm.close()
+            raise ValueError(f"Unsupported manifest segment: {path}")
+
+    def key(self, index: int) -> Tuple[bytes, int]:
+        name, version = struct.unpack_from("<64sI", self._mm, HEADER.size + index * RECORD.size)
+        return name, version
+
+    def entry(self, index: int) -> ManifestEntry:
+        name, version, path_len, path_off, timestamp, checksum = \
+            RECORD.unpack_from(self._mm, HEADER.size + index * RECORD.size)
+        start = self.heap_offset + path_off
+        return ManifestEntry(
+            name.rstrip(b"\0").decode('utf-8'),
+            version,
+            self._mm[start:start + path_len].decode('utf-8'),
+            timestamp,
+            checksum.hex() if any(checksum) else "",
+        )
+
+    def lower_bound(self, key: Tuple[bytes, int]) -> int:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+class VersionManifest:
+    """Append-only, memory-mapped index of published asset versions."""
+
+    def __init__(self, directory: PathLike, max_segments: int = 16):
+        """Open or create a manifest.
+
+        Args:
+            directory: Directory holding the segment files
+            max_segments: Segment count above which appends merge the newest
+                similarly sized segments
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_segments = max_segments
+        self._segments: List[_Segment] = []
+        self._lock_fd = os.open(str(self.directory / "manifest.lock"),
+                                os.O_RDWR | os.O_CREAT, 0o666)
+        self._thread_lock = threading.Lock()
+        self.refresh()
+        logger.info(f"VersionManifest opened: {directory} ({len(self._segments)} segments)")
+
+    def refresh(self) -> None:
+        """Pick up segments written or compacted by other processes."""
+        current = {segment.path: segment for segment in self._segments}
+        segments = []
+        for path in sorted(self.directory.glob(SEGMENT_GLOB)):
+            segment = current.get(path)
+            try:
+                if segment is not None and segment.inode == os.stat(str(path)).st_ino:
+                    del current[path]
+                else:
+                    segment = _Segment(path)
+            except FileNotFoundError:
+                continue  # Merged away by another process since the glob
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping manifest segment {path}: {e}")
+                continue
+            segments.append(segment)
+        for segment in current.values():
+            segment.close()
+        self._segments = segments
+
+    def close(self) -> None:
+        """Unmap all segments and release the lock file."""
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+        os.close(self._lock_fd)
+
+    @contextmanager
+    def _locked(self):
+        """Hold the merge lock shared by every process using the directory."""
+        with self._thread_lock:
+            if fcntl is not None:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def _write_segment(self, entries: Iterable[ManifestEntry],
+                       replace_path: Optional[Path] = None) -> Path:
+        """Write sorted entries as a new segment and move it into place.
+
+        Records and paths are streamed to disk, so merging very large
+        manifests does not need to hold them in memory.
+
+        Args:
+            entries: Entries sorted by (name, version) without duplicates
+            replace_path: Segment name to atomically overwrite (used by
+                compaction); by default a new sequence number is allocated
+
+        Returns:
+            Path of the new segment
+        """
+        tmp_path = self.directory / f".tmp-{os.getpid()}-{threading.get_ident()}.stm"
+        count = 0
+        heap_size = 0
+        with open(tmp_path, 'wb') as f, tempfile.TemporaryFile(dir=str(self.directory)) as heap:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size, 0, 0))
+            for entry in entries:
+                path_bytes = entry.path.encode('utf-8')
+                f.write(RECORD.pack(_encode_name(entry.name), entry.version, len(path_bytes),
+                                    heap_size, entry.timestamp,
+                                    bytes.fromhex(entry.checksum) if entry.checksum else bytes(32)))
+                heap.write(path_bytes)
+                heap_size += len(path_bytes)
+                count += 1
+            heap.seek(0)
+            shutil.copyfileobj(heap, f)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size, count,
+                                HEADER.size + count * RECORD.size))
+            f.flush()
+            os.fsync(f.fileno())
+
+        if replace_path is not None:
+            os.replace(str(tmp_path), str(replace_path))
+            return replace_path
+
+        # os.link fails if the name is taken, so concurrent writers never clobber each other
+        existing = sorted(self.directory.glob(SEGMENT_GLOB))
+        seq = _segment_seq(existing[-1]) + 1 if existing else 1
+        try:
+            while True:
+                final_path = self.directory / f"segment-{seq:012d}.stm"
+                try:
+                    os.link(str(tmp_path), str(final_path))
+                    return final_path
+                except FileExistsError:
+                    seq += 1
+        finally:
+            os.unlink(str(tmp_path))
+
+    def append(self, entries: Iterable[ManifestEntry]) -> int:
+        """Atomically add entries as a new segment.
+
+        Entries for an existing (name, version) replace the older record.
+
+        Args:
+            entries: Entries to add
+
+        Returns:
+            Number of entries written
+        """
+        latest = {}
+        for entry in entries:
+            _encode_name(entry.name)
+            latest[(entry.name.encode('utf-8'), entry.version)] = entry
+        if not latest:
+            return 0
+        self._write_segment(latest[key] for key in sorted(latest))
+        self.refresh()
+        if len(self._segments) > self.max_segments:
+            self._merge_tail()
+        return len(latest)
+
+    def _merged(self, start_key: Optional[Tuple[bytes, int]] = None,
+                segments: Optional[List[_Segment]] = None) -> Iterator[ManifestEntry]:
+        """Merge segments in key order, newest segment winning on duplicates."""
+        if segments is None:
+            segments = self._segments
+        def keyed(segment, rank):
+            start = segment.lower_bound(start_key) if start_key else 0
+            for index in range(start, segment.count):
+                name, version = segment.key(index)
+                yield name, version, rank, index, segment
+
+        iterators = [keyed(segment, rank)
+                     for rank, segment in enumerate(reversed(segments))]
+        previous = None
+        for name, version, _, index, segment in heapq.merge(*iterators):
+            if (name, version) != previous:
+                previous = (name, version)
+                yield segment.entry(index)
+
+    def __iter__(self) -> Iterator[ManifestEntry]:
+        return self._merged()
+
+    def versions(self, asset_name: str) -> List[ManifestEntry]:
+        """Get all versions of an asset.
+
+        Args:
+            asset_name: Name of the asset
+
+        Returns:
+            Entries sorted by version
+        """
+        name = _encode_name(asset_name)
+        found = []
+        for entry in self._merged((name, 0)):
+            if entry.name != asset_name:
+                break
+            found.append(entry)
+        return found
+
+    def get(self, asset_name: str, version: int) -> Optional[ManifestEntry]:
+        """Get a single published version.
+
+        Args:
+            asset_name: Name of the asset
+            version: Version number
+
+        Returns:
+            ManifestEntry, or None if not recorded
+        """
+        key = (_encode_name(asset_name), version)
+        for segment in reversed(self._segments):
+            index = segment.lower_bound(key)
+            if index < segment.count and segment.key(index) == key:
+                return segment.entry(index)
+        return None
+
+    def latest(self, asset_name: str) -> Optional[ManifestEntry]:
+        """Get the highest recorded version of an asset.
+
+        Args:
+            asset_name: Name of the asset
+
+        Returns:
+            ManifestEntry, or None if the asset is not recorded
+        """
+        name = _encode_name(asset_name)
+        best = None
+        for segment in reversed(self._segments):
+            index = segment.lower_bound((name, 1 << 32)) - 1
+            if index < 0:
+                continue
+            key = segment.key(index)
+            if key[0] == name and (best is None or key[1] > best.version):
+                best = segment.entry(index)
+        return best
+
+    def _replace_segments(self, segments: List[_Segment]) -> Path:
+        """Merge consecutive segments into one, dropping superseded records.
+
+        The merged segment takes the place of the newest segment in the run,
+        so older segments still sort before it and anything appended
+        concurrently still sorts after it. The caller must hold the merge
+        lock and have refreshed under it.
+        """
+        old_paths = [segment.path for segment in segments]
+        last_seq = _segment_seq(old_paths[-1])
+        new_path = self._write_segment(
+            self._merged(segments=segments),
+            replace_path=self.directory / f"segment-{last_seq:012d}-c.stm")
+        for path in old_paths:
+            if path != new_path:
+                try:
+                    os.unlink(str(path))
+                except FileNotFoundError:
+                    pass
+        self.refresh()
+        return new_path
+
+    def _merge_tail(self) -> None:
+        """Merge the newest segments while each older one is no larger than the run.
+
+        This keeps segment sizes roughly doubling from newest to oldest, so
+        an append only ever rewrites records of similar age instead of the
+        whole manifest.
+        """
+        with self._locked():
+            self.refresh()
+            if len(self._segments) <= self.max_segments:
+                return  # Another process merged first
+            run = self._select_tail()
+            new_path = self._replace_segments(run)
+        logger.debug(f"VersionManifest merged {len(run)} segments into {new_path.name}")
+
+    def _select_tail(self) -> List[_Segment]:
+        run = self._segments[-2:]
+        total = sum(segment.count for segment in run)
+        for segment in reversed(self._segments[:-2]):
+            if segment.count > total:
+                break
+            run.insert(0, segment)
+            total += segment.count
+        return run
+
+    def compact(self) -> None:
+        """Merge all segments into one, dropping superseded records."""
+        with self._locked():
+            self.refresh()
+            if len(self._segments) <= 1:
+                return
+            count = len(self._segments)
+            new_path = self._replace_segments(self._segments)
+        logger.info(f"VersionManifest compacted {count} segments into {new_path.name}")
@@ -8,6 +8,10 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
+from studio_tools.filesystem.cache import MetadataCache, get_default_cache
+from studio_tools.publishing.manifest import (ManifestEntry, VersionManifest, check_name,
+                                              file_checksum)
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,13 +20,19 @@ class AssetPublisher:
     
     VERSION_FORMAT = "v{:03d}"
     
-    def __init__(self, archive_path: str = "/studio/archive"):
+    def __init__(self, archive_path: str = "/studio/archive",
+                 fs_cache: Optional[MetadataCache] = None,
+                 manifest: Optional[VersionManifest] = None):
         """Initialize asset publisher.
         
         Args:
             archive_path: Path to the archive/publish directory
+            fs_cache: Metadata cache (defaults to the shared process cache)
+            manifest: Optional on-disk manifest that every publish is recorded in
         """
         self.archive_path = Path(archive_path)
+        self.fs_cache = fs_cache or get_default_cache()
+        self.manifest = manifest
         self.published_assets = []
         logger.info(f"AssetPublisher initialized with archive: {archive_path}")
     
@@ -30,6 +40,9 @@ class AssetPublisher:
                      version: Optional[int] = None) -> bool:
         """Publish an asset to the archive.
         
+        With a manifest attached, asset names are limited to 64 UTF-8 bytes.
+        Nothing is created or recorded unless the whole publish succeeds.
+        
         Args:
             asset_name: Name of the asset
             asset_path: Path to the asset file
@@ -39,42 +52,103 @@ class AssetPublisher:
             True if successful, False otherwise
         """
         try:
-            if version is None:
-                version = self._get_next_version(asset_name)
+            checksum = ""
+            if self.manifest is not None:
+                check_name(asset_name)
+                if self.fs_cache.is_file(asset_path):
+                    checksum = file_checksum(asset_path)
             
+            created_path = None
+            if version is None:
+                version, created_path = self._claim_next_version(asset_name)
+                archive_asset_path = created_path
             version_str = self.VERSION_FORMAT.format(version)
-            archive_asset_path = self.archive_path / asset_name / version_str
-            archive_asset_path.mkdir(parents=True, exist_ok=True)
+            if created_path is None:
+                archive_asset_path = self.archive_path / asset_name / version_str
+                try:
+                    archive_asset_path.mkdir(parents=True)
+                    created_path = archive_asset_path
+                except FileExistsError:
+                    pass
+            self.fs_cache.invalidate(archive_asset_path)
+            self.fs_cache.invalidate(archive_asset_path.parent)
+            
+            published_at = datetime.now()
+            if self.manifest is not None:
+                try:
+                    self.manifest.append([ManifestEntry(asset_name, version,
+                                                        str(archive_asset_path),
+                                                        published_at.timestamp(), checksum)])
+                except Exception:
+                    if created_path is not None:
+                        created_path.rmdir()
+                        self.fs_cache.invalidate(created_path)
+                    raise
             
             self.published_assets.append({
                 'name': asset_name,
                 'version': version_str,
                 'path': str(archive_asset_path),
-                'published_at': datetime.now().isoformat()
+                'published_at': published_at.isoformat()
             })
-            
             logger.info(f"Published {asset_name} {version_str} to {archive_asset_path}")
             return True
         except Exception as e:
             logger.error(f"Error publishing asset {asset_name}: {e}")
             return False
     
+    def _claim_next_version(self, asset_name: str):
+        """Create the directory for the next free version of an asset.
+        
+        The version directory is created exclusively, so publishers racing
+        on the same archive (or working from a stale manifest) never share
+        a version; on collision the next number is tried.
+        
+        Args:
+            asset_name: Name of the asset
+            
+        Returns:
+            Tuple of (version: int, version directory: Path)
+        """
+        asset_dir = self.archive_path / asset_name
+        asset_dir.mkdir(parents=True, exist_ok=True)
+        version = self._get_next_version(asset_name)
+        while True:
+            version_path = asset_dir / self.VERSION_FORMAT.format(version)
+            try:
+                version_path.mkdir()
+                return version, version_path
+            except FileExistsError:
+                self.fs_cache.invalidate(version_path)
+                version += 1
+    
     def _get_next_version(self, asset_name: str) -> int:
         """Get the next version number for an asset.
         
+        When a manifest is attached and already records the asset, the
+        version is taken from it instead of listing the archive. The
+        manifest may lag behind the archive; _claim_next_version skips
+        any version that turns out to exist already.
+        
         Args:
             asset_name: Name of the asset
             
         Returns:
             Next version number
         """
+        if self.manifest is not None:
+            self.manifest.refresh()
+            latest = self.manifest.latest(asset_name)
+            if latest is not None:
+                return latest.version + 1
+        
         asset_dir = self.archive_path / asset_name
-        if not asset_dir.exists():
+        if not self.fs_cache.exists(asset_dir):
             return 1
         
         versions = []
-        for item in asset_dir.iterdir():
-            if item.is_dir() and item.name.startswith('v'):
+        for item in self.fs_cache.iterdir(asset_dir):
+            if item.name.startswith('v') and self.fs_cache.is_dir(item):
                 try:
                     version_num = int(item.name[1:])
                     versions.append(version_num)
@@ -0,0 +1,224 @@
+"""Version retention for the publish archive.
+
+Applies ``publishing.max_versions`` from pipeline.yaml and
+``file_organization.archive_older_than_days`` from studio_standards.yaml to
+the archive. Planning is a single parallel pass over the archive and never
+modifies anything; applying a plan runs rate-limited workers so pruning does
+not saturate the filer during production hours.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from studio_tools.filesystem.cache import MetadataCache, get_default_cache
+
+logger = logging.getLogger(__name__)
+
+DELETE = "delete"
+MOVE = "move"
+
+
+class RetentionPolicy(NamedTuple):
+    """How many versions to keep and when to move them to cold storage."""
+
+    max_versions: int = 10
+    archive_older_than_days: int = 90
+
+    @classmethod
+    def from_config(cls) -> "RetentionPolicy":
+        """Build a policy from the packaged configuration files.
+
+        Returns:
+            RetentionPolicy using configured values where present
+        """
+        from studio_tools.config import PIPELINE_CONFIG, STUDIO_STANDARDS
+
+        publishing = (PIPELINE_CONFIG.get('pipeline', {}) or {}).get('publishing', {}) or {}
+        organization = (STUDIO_STANDARDS.get('standards', {}) or {}).get('file_organization', {}) or {}
+        return cls(
+            max_versions=publishing.get('max_versions', cls._field_defaults['max_versions']),
+            archive_older_than_days=organization.get(
+                'archive_older_than_days', cls._field_defaults['archive_older_than_days']),
+        )
+
+
+class RetentionAction(NamedTuple):
+    """A planned delete or move of one published version."""
+
+    asset: str
+    version: str
+    path: str
+    action: str
+    reason: str
+    destination: Optional[str] = None
+
+
+class _RateLimiter:
+    """Space operations evenly across all worker threads."""
+
+    def __init__(self, max_per_second: Optional[float]):
+        self.interval = 1.0 / max_per_second if max_per_second else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RetentionEngine:
+    """Plan and apply version retention on a publish archive."""
+
+    def __init__(self, archive_path: str, policy: Optional[RetentionPolicy] = None,
+                 cold_storage_path: Optional[str] = None, max_workers: int = 8,
+                 fs_cache: Optional[MetadataCache] = None):
+        """Initialize retention engine.
+
+        Args:
+            archive_path: Path to the archive/publish directory
+            policy: Retention policy (defaults to the configured policy)
+            cold_storage_path: Where old versions are moved; without it,
+                versions over the limit are deleted and old versions are kept
+            max_workers: Threads used to scan the archive
+            fs_cache: Metadata cache (defaults to the shared process cache)
+        """
+        self.archive_path = Path(archive_path)
+        self.policy = policy or RetentionPolicy.from_config()
+        self.cold_storage_path = Path(cold_storage_path) if cold_storage_path else None
+        self.max_workers = max_workers
+        self.fs_cache = fs_cache or get_default_cache()
+        logger.info(f"RetentionEngine initialized for archive: {archive_path}")
+
+    def _plan_asset(self, asset_dir: str, now: float) -> List[RetentionAction]:
+        """Plan actions for the versions of one asset.
+
+        Args:
+            asset_dir: Path to the asset's archive directory
+            now: Reference time for age calculations
+
+        Returns:
+            List of planned actions
+        """
+        versions = []
+        with os.scandir(asset_dir) as it:
+            for entry in it:
+                if not entry.name.startswith('v') or not entry.is_dir():
+                    continue
+                try:
+                    versions.append((int(entry.name[1:]), entry.name, entry.path,
+                                     entry.stat().st_mtime))
+                except ValueError:
+                    pass
+        versions.sort(reverse=True)
+
+        asset = os.path.basename(asset_dir)
+        max_age = self.policy.archive_older_than_days * 86400
+        actions = []
+        for index, (_, name, path, mtime) in enumerate(versions):
+            destination = None
+            if self.cold_storage_path is not None:
+                destination = str(self.cold_storage_path / asset / name)
+            if index >= self.policy.max_versions:
+                reason = f"exceeds max_versions ({self.policy.max_versions})"
+                actions.append(RetentionAction(asset, name, path,
+                                               MOVE if destination else DELETE,
+                                               reason, destination))
+            elif index > 0 and destination and now - mtime > max_age:
+                reason = f"older than {self.policy.archive_older_than_days} days"
+                actions.append(RetentionAction(asset, name, path, MOVE, reason, destination))
+        return actions
+
+    def plan(self, now: Optional[float] = None) -> List[RetentionAction]:
+        """Scan the archive and plan retention actions without changing anything.
+
+        The newest version of every asset is always kept.
+
+        Args:
+            now: Reference time for age calculations (defaults to current time)
+
+        Returns:
+            Planned actions sorted by asset and version
+        """
+        now = time.time() if now is None else now
+        try:
+            with os.scandir(self.archive_path) as it:
+                asset_dirs = [entry.path for entry in it if entry.is_dir()]
+        except FileNotFoundError:
+            logger.warning(f"Archive not found: {self.archive_path}")
+            return []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            per_asset = executor.map(lambda d: self._plan_asset(d, now), asset_dirs)
+            actions = [action for asset_actions in per_asset for action in asset_actions]
+
+        actions.sort(key=lambda a: (a.asset, a.version))
+        logger.info(f"Retention plan: {len(actions)} actions across {len(asset_dirs)} assets")
+        return actions
+
+    @staticmethod
+    def format_plan(actions: List[RetentionAction]) -> str:
+        """Render a plan as human-readable dry-run output.
+
+        Args:
+            actions: Planned actions
+
+        Returns:
+            One line per action
+        """
+        lines = []
+        for action in actions:
+            target = f" -> {action.destination}" if action.destination else ""
+            lines.append(f"{action.action.upper():6} {action.asset} {action.version}"
+                         f"{target} ({action.reason})")
+        return "\n".join(lines)
+
+    def _apply_action(self, action: RetentionAction, limiter: _RateLimiter) -> bool:
+        limiter.wait()
+        try:
+            if action.action == MOVE:
+                # shutil.move would nest the version inside an existing destination
+                if os.path.lexists(action.destination):
+                    logger.error(f"Cold storage destination already exists, "
+                                 f"not moving {action.path}: {action.destination}")
+                    return False
+                Path(action.destination).parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(action.path, action.destination)
+                self.fs_cache.invalidate(action.destination)
+            else:
+                shutil.rmtree(action.path)
+            self.fs_cache.invalidate(action.path)
+            logger.info(f"Retention {action.action}: {action.path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error applying retention to {action.path}: {e}")
+            return False
+
+    def apply(self, actions: List[RetentionAction], workers: int = 2,
+              max_ops_per_second: Optional[float] = 5.0) -> Dict[str, int]:
+        """Execute a plan with rate-limited workers.
+
+        Args:
+            actions: Planned actions (from plan())
+            workers: Number of concurrent delete/move workers
+            max_ops_per_second: Overall operation rate limit (None = unlimited)
+
+        Returns:
+            Dictionary with counts of applied and failed actions
+        """
+        limiter = _RateLimiter(max_ops_per_second)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda a: self._apply_action(a, limiter), actions))
+        applied = sum(results)
+        return {'applied': applied, 'failed': len(results) - applied}
@@ -0,0 +1,246 @@
+"""Shot disk usage accounting for studio pipeline.
+
+Reports how much space each shot and each shot folder (cache, renders,
+fx, ...) uses. Shot subtrees are walked in parallel with a thread pool,
+hardlinked files are counted once per project, and per-directory totals
+are cached by directory mtime so repeated reports only re-read directories
+whose entries changed.
+
+Note that a directory's mtime changes when entries are added, removed or
+renamed, not when an existing file is rewritten in place. Renders and
+caches are normally written as new files, so this is the right trade-off
+for farm storage; pass ``use_cache=False`` for an exact full rescan.
+"""
+
+import json
+import logging
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from studio_tools.shots.shot_creator import ShotCreator
+
+logger = logging.getLogger(__name__)
+
+SHOT_ROOT_FOLDER = "."
+
+
+class UsageEntry(NamedTuple):
+    """Disk usage of one folder of one shot."""
+
+    shot: str
+    folder: str
+    bytes: int
+    files: int
+
+
+def _allocated_size(st: os.stat_result) -> int:
+    """Bytes actually allocated on disk (falls back to size on Windows)."""
+    blocks = getattr(st, 'st_blocks', None)
+    return blocks * 512 if blocks is not None else st.st_size
+
+
+def format_size(num_bytes: int) -> str:
+    """Format a byte count for display.
+
+    Args:
+        num_bytes: Number of bytes
+
+    Returns:
+        Human-readable size (e.g. "1.50 GB")
+    """
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024 or unit == "TB":
+            return f"{size:.2f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+
+
+class DiskUsageScanner:
+    """Compute per-shot and per-folder disk usage for a project."""
+
+    def __init__(self, project_path: str = "/studio/projects",
+                 max_workers: int = 16, cache_path: Optional[str] = None):
+        """Initialize disk usage scanner.
+
+        Args:
+            project_path: Base project directory containing shot directories
+            max_workers: Threads used to walk shot subtrees
+            cache_path: JSON file storing per-directory totals between runs
+        """
+        self.project_path = Path(project_path)
+        self.max_workers = max_workers
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._cache: Dict[str, list] = {}
+        if self.cache_path is not None and self.cache_path.exists():
+            try:
+                with open(self.cache_path, 'r') as f:
+                    self._cache = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable disk usage cache {self.cache_path}: {e}")
+        logger.info(f"DiskUsageScanner initialized for project: {project_path}")
+
+    def _scan_directory(self, path: str, use_cache: bool) -> list:
+        """Get the totals for the entries directly inside one directory.
+
+        Args:
+            path: Directory to read
+            use_cache: Reuse the cached totals if the directory mtime matches
+
+        Returns:
+            [mtime_ns, bytes, files, subdirs, linked] where linked holds
+            [dev, inode, bytes] for files with more than one hard link
+        """
+        mtime_ns = os.stat(path).st_mtime_ns
+        cached = self._cache.get(path)
+        if use_cache and cached is not None and cached[0] == mtime_ns:
+            return cached
+
+        own_bytes = 0
+        own_files = 0
+        subdirs = []
+        linked = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                if stat.S_ISDIR(st.st_mode):
+                    subdirs.append(entry.name)
+                elif stat.S_ISREG(st.st_mode):
+                    if st.st_nlink > 1:
+                        linked.append([st.st_dev, st.st_ino, _allocated_size(st)])
+                    else:
+                        own_bytes += _allocated_size(st)
+                        own_files += 1
+        return [mtime_ns, own_bytes, own_files, subdirs, linked]
+
+    def _scan_tree(self, root: str, recursive: bool,
+                   use_cache: bool) -> Tuple[int, int, list, Dict[str, list]]:
+        """Walk one shot folder.
+
+        Args:
+            root: Folder to walk
+            recursive: Descend into subdirectories
+            use_cache: Reuse cached per-directory totals
+
+        Returns:
+            Tuple of (bytes, files, linked inodes, visited directory totals)
+        """
+        total_bytes = 0
+        total_files = 0
+        linked = []
+        visited = {}
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            try:
+                info = self._scan_directory(current, use_cache)
+            except (FileNotFoundError, NotADirectoryError, PermissionError) as e:
+                logger.debug(f"Skipping unreadable directory {current}: {e}")
+                continue
+            visited[current] = info
+            total_bytes += info[1]
+            total_files += info[2]
+            linked.extend(info[4])
+            if recursive:
+                stack.extend(os.path.join(current, name) for name in info[3])
+        return total_bytes, total_files, linked, visited
+
+    def scan(self, use_cache: bool = True) -> List[UsageEntry]:
+        """Compute usage of every folder of every shot in the project.
+
+        Folders from ShotCreator.REQUIRED_FOLDERS come first for each shot,
+        followed by any other folders; files directly inside a shot directory
+        are reported under the folder ".". A hardlinked file is counted once,
+        for the first shot/folder it is found in.
+
+        Args:
+            use_cache: Reuse cached totals for directories whose mtime is unchanged
+
+        Returns:
+            Usage entries sorted by size, largest first
+        """
+        try:
+            with os.scandir(self.project_path) as it:
+                shots = sorted(entry.name for entry in it if entry.is_dir())
+        except FileNotFoundError:
+            logger.warning(f"Project path not found: {self.project_path}")
+            return []
+
+        tasks = []
+        for shot_name in shots:
+            shot_path = str(self.project_path / shot_name)
+            tasks.append((shot_name, SHOT_ROOT_FOLDER, shot_path, False))
+            try:
+                with os.scandir(shot_path) as it:
+                    folders = [entry.name for entry in it if entry.is_dir()]
+            except OSError:
+                continue
+            known = [f for f in ShotCreator.REQUIRED_FOLDERS if f in folders]
+            for folder in known + sorted(set(folders) - set(known)):
+                tasks.append((shot_name, folder, os.path.join(shot_path, folder), True))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(
+                lambda task: self._scan_tree(task[2], task[3], use_cache), tasks))
+
+        entries = []
+        seen_inodes: Set[Tuple[int, int]] = set()
+        new_cache = {}
+        for (shot_name, folder, _, _), (total_bytes, total_files, linked, visited) \
+                in zip(tasks, results):
+            for dev, ino, size in linked:
+                if (dev, ino) not in seen_inodes:
+                    seen_inodes.add((dev, ino))
+                    total_bytes += size
+                    total_files += 1
+            entries.append(UsageEntry(shot_name, folder, total_bytes, total_files))
+            new_cache.update(visited)
+
+        self._cache = new_cache
+        self._save_cache()
+        entries.sort(key=lambda e: (-e.bytes, e.shot, e.folder))
+        logger.info(f"Disk usage scanned {len(shots)} shots, {len(new_cache)} directories")
+        return entries
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self._cache, f)
+        os.replace(str(tmp_path), str(self.cache_path))
+
+    @staticmethod
+    def shot_totals(entries: List[UsageEntry]) -> List[Tuple[str, int]]:
+        """Sum folder entries per shot.
+
+        Args:
+            entries: Entries from scan()
+
+        Returns:
+            List of (shot, bytes) sorted by size, largest first
+        """
+        totals: Dict[str, int] = {}
+        for entry in entries:
+            totals[entry.shot] = totals.get(entry.shot, 0) + entry.bytes
+        return sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+
+    @staticmethod
+    def folder_totals(entries: List[UsageEntry]) -> List[Tuple[str, int]]:
+        """Sum shot entries per folder type across the project.
+
+        Args:
+            entries: Entries from scan()
+
+        Returns:
+            List of (folder, bytes) sorted by size, largest first
+        """
+        totals: Dict[str, int] = {}
+        for entry in entries:
+            totals[entry.folder] = totals.get(entry.folder, 0) + entry.bytes
+        return sorted(totals.items(), key=lambda item: (-item[1], item[0]))
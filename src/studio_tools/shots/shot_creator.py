@@ -6,6 +6,9 @@ Provides utilities for creating and managing shots in the production pipeline.
 import logging
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
+
+from studio_tools.filesystem.cache import MetadataCache, get_default_cache
 
 logger = logging.getLogger(__name__)
 
@@ -15,17 +18,20 @@ class ShotCreator:
     
     REQUIRED_FOLDERS = ['cache', 'geo', 'renders', 'scenes', 'textures', 'fx']
     
-    def __init__(self, shot_name: str, project_path: str = "/studio/projects"):
+    def __init__(self, shot_name: str, project_path: str = "/studio/projects",
+                 fs_cache: Optional[MetadataCache] = None):
         """Initialize shot creator.
         
         Args:
             shot_name: Name of the shot (e.g., "SQ010_SH020")
             project_path: Base project directory path
+            fs_cache: Metadata cache (defaults to the shared process cache)
         """
         self.shot_name = shot_name
         self.project_path = Path(project_path)
         self.shot_path = self.project_path / shot_name
         self.created_at = datetime.now().isoformat()
+        self.fs_cache = fs_cache or get_default_cache()
         logger.info(f"ShotCreator initialized for shot: {shot_name}")
     
     def create_shot_directory(self) -> bool:
@@ -38,7 +44,9 @@ class ShotCreator:
             for folder in self.REQUIRED_FOLDERS:
                 folder_path = self.shot_path / folder
                 folder_path.mkdir(parents=True, exist_ok=True)
+                self.fs_cache.invalidate(folder_path)
                 logger.info(f"Created folder: {folder_path}")
+            self.fs_cache.invalidate(self.shot_path)
             
             logger.info(f"Shot directory structure created for: {self.shot_name}")
             return True
@@ -58,6 +66,7 @@ class ShotCreator:
             
             # Create a placeholder Maya scene file
             scene_file.touch()
+            self.fs_cache.invalidate(scene_file)
             logger.info(f"Maya scene created: {scene_file}")
             return True
         except Exception as e:
@@ -75,7 +84,7 @@ class ShotCreator:
             'project_path': str(self.project_path),
             'shot_path': str(self.shot_path),
             'created_at': self.created_at,
-            'exists': self.shot_path.exists()
+            'exists': self.fs_cache.exists(self.shot_path)
         }
 
 
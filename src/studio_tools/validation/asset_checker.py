@@ -4,8 +4,13 @@ Provides utilities for validating assets against studio standards.
 """
 
 import logging
+import os
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from studio_tools.filesystem.cache import MetadataCache, get_default_cache
+from studio_tools.filesystem.journal import DELETED, ChangeJournal
+from studio_tools.validation.results import CheckCode, CheckRecord, render_record
 
 logger = logging.getLogger(__name__)
 
@@ -13,44 +18,74 @@ logger = logging.getLogger(__name__)
 class AssetChecker:
     """Validate assets against studio standards."""
     
-    def __init__(self):
-        """Initialize asset checker."""
+    SUPPORTED_FORMATS = ['.fbx', '.abc', '.usd', '.obj']
+    
+    def __init__(self, fs_cache: Optional[MetadataCache] = None):
+        """Initialize asset checker.
+        
+        Args:
+            fs_cache: Metadata cache (defaults to the shared process cache)
+        """
+        self.fs_cache = fs_cache or get_default_cache()
         self.check_results = []
         logger.info("AssetChecker initialized")
     
-    def run_asset_checks(self, asset_path: str) -> Tuple[bool, List[str]]:
-        """Run all validation checks on an asset.
+    def check_records(self, asset_path: str) -> Iterator[CheckRecord]:
+        """Yield structured results of all validation checks on an asset.
+        
+        Checks stop after the first failure, as in run_asset_checks.
         
         Args:
             asset_path: Path to the asset file
             
-        Returns:
-            Tuple of (success: bool, messages: List[str])
+        Yields:
+            CheckRecord for each check performed
         """
-        asset_file = Path(asset_path)
-        messages = []
+        asset_path = str(asset_path)
         
         # Check file exists
-        if not asset_file.exists():
-            messages.append(f"❌ Asset file not found: {asset_path}")
-            return False, messages
-        
-        messages.append(f"✓ Asset file found: {asset_file.name}")
+        meta = self.fs_cache.stat(asset_path)
+        if not meta.exists:
+            yield CheckRecord(asset_path, CheckCode.FILE_NOT_FOUND)
+            return
+        yield CheckRecord(asset_path, CheckCode.FILE_FOUND)
         
         # Check file size
-        file_size_mb = asset_file.stat().st_size / (1024 * 1024)
-        if file_size_mb > 500:
-            messages.append(f"⚠ Large file size: {file_size_mb:.2f}MB (>500MB)")
-        else:
-            messages.append(f"✓ File size acceptable: {file_size_mb:.2f}MB")
+        file_size_mb = meta.size / (1024 * 1024)
+        code = CheckCode.SIZE_LARGE if file_size_mb > 500 else CheckCode.SIZE_OK
+        yield CheckRecord(asset_path, code, file_size_mb)
         
         # Check file extension
-        supported_extensions = ['.fbx', '.abc', '.usd', '.obj']
-        if asset_file.suffix.lower() not in supported_extensions:
-            messages.append(f"❌ Unsupported file format: {asset_file.suffix}")
-            return False, messages
+        if os.path.splitext(asset_path)[1].lower() not in self.SUPPORTED_FORMATS:
+            yield CheckRecord(asset_path, CheckCode.FORMAT_UNSUPPORTED)
+            return
+        yield CheckRecord(asset_path, CheckCode.FORMAT_OK)
+    
+    def iter_asset_checks(self, asset_paths: Iterable[str]) -> Iterator[CheckRecord]:
+        """Lazily check many assets without building messages or storing results.
+        
+        Args:
+            asset_paths: Paths to the asset files (consumed lazily)
+            
+        Yields:
+            CheckRecord for each check performed on each asset
+        """
+        for asset_path in asset_paths:
+            yield from self.check_records(asset_path)
+    
+    def run_asset_checks(self, asset_path: str) -> Tuple[bool, List[str]]:
+        """Run all validation checks on an asset.
         
-        messages.append(f"✓ Supported file format: {asset_file.suffix}")
+        Args:
+            asset_path: Path to the asset file
+            
+        Returns:
+            Tuple of (success: bool, messages: List[str])
+        """
+        records = list(self.check_records(asset_path))
+        messages = [render_record(record) for record in records]
+        if not all(record.passed for record in records):
+            return False, messages
         
         # Store results
         self.check_results.append({
@@ -61,6 +96,34 @@ class AssetChecker:
         
         return True, messages
     
+    def run_incremental_checks(self, journal: ChangeJournal,
+                               consumer: str = "asset_checker") -> Dict[str, Tuple[bool, List[str]]]:
+        """Run checks only on assets created or modified since the last run.
+        
+        Args:
+            journal: Change journal tracking the asset roots
+            consumer: Cursor name used to remember the last processed change
+            
+        Returns:
+            Dictionary mapping asset path to (success, messages)
+        """
+        results = {}
+        events = journal.read_changes(consumer)
+        for event in events:
+            if event.kind == DELETED or event.is_dir:
+                results.pop(event.path, None)
+                continue
+            if Path(event.path).suffix.lower() in self.SUPPORTED_FORMATS:
+                results[event.path] = None
+        
+        for asset_path in results:
+            results[asset_path] = self.run_asset_checks(asset_path)
+        
+        if events:
+            journal.commit(consumer, events[-1].seq)
+        logger.info(f"Incremental checks ran on {len(results)} of {len(events)} changes")
+        return results
+    
     def check_naming_convention(self, asset_name: str) -> Tuple[bool, str]:
         """Check if asset name follows studio conventions.
         
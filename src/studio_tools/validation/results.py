@@ -0,0 +1,166 @@
+"""Structured validation results for machine consumption.
+
+Checks can yield compact CheckRecord tuples (path, code, numeric value)
+instead of formatted messages. Human-readable text is produced only on
+demand with render_record(), and records can be streamed to JSON Lines or
+written as column batches for downstream analytics.
+"""
+
+import json
+import os
+from array import array
+from enum import IntEnum
+from typing import Iterable, NamedTuple, TextIO
+
+
+class CheckCode(IntEnum):
+    """Result codes produced by asset checks."""
+
+    FILE_FOUND = 1
+    FILE_NOT_FOUND = 2
+    SIZE_OK = 3
+    SIZE_LARGE = 4
+    FORMAT_OK = 5
+    FORMAT_UNSUPPORTED = 6
+
+
+FAILURE_CODES = frozenset([CheckCode.FILE_NOT_FOUND, CheckCode.FORMAT_UNSUPPORTED])
+
+
+class CheckRecord(NamedTuple):
+    """A single check result."""
+
+    path: str
+    code: CheckCode
+    value: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return self.code not in FAILURE_CODES
+
+
+def render_record(record: CheckRecord) -> str:
+    """Format a record as the human-readable message used by AssetChecker.
+
+    Args:
+        record: Check record
+
+    Returns:
+        Message string
+    """
+    code = record.code
+    if code == CheckCode.FILE_FOUND:
+        return f"✓ Asset file found: {os.path.basename(record.path)}"
+    if code == CheckCode.FILE_NOT_FOUND:
+        return f"❌ Asset file not found: {record.path}"
+    if code == CheckCode.SIZE_LARGE:
+        return f"⚠ Large file size: {record.value:.2f}MB (>500MB)"
+    if code == CheckCode.SIZE_OK:
+        return f"✓ File size acceptable: {record.value:.2f}MB"
+    suffix = os.path.splitext(record.path)[1]
+    if code == CheckCode.FORMAT_UNSUPPORTED:
+        return f"❌ Unsupported file format: {suffix}"
+    return f"✓ Supported file format: {suffix}"
+
+
+def write_jsonl(records: Iterable[CheckRecord], stream: TextIO) -> int:
+    """Stream records as JSON Lines.
+
+    Args:
+        records: Records to write (consumed lazily)
+        stream: Text stream to write to
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    for path, code, value in records:
+        stream.write(json.dumps({'path': path, 'code': code.name, 'value': value}))
+        stream.write("\n")
+        count += 1
+    return count
+
+
+class ColumnarWriter:
+    """Write records as column batches.
+
+    Records are buffered column by column and flushed every ``batch_size``
+    rows, so memory stays bounded however many files are checked. With
+    ``output_format="json"`` each batch is one JSON line of parallel arrays;
+    with ``output_format="arrow"`` batches are written as an Arrow IPC stream
+    (requires pyarrow).
+    """
+
+    def __init__(self, stream, batch_size: int = 65536, output_format: str = "json"):
+        """Initialize columnar writer.
+
+        Args:
+            stream: Text stream (json) or binary stream (arrow)
+            batch_size: Rows per batch
+            output_format: "json" or "arrow"
+        """
+        if output_format not in ("json", "arrow"):
+            raise ValueError(f"Unknown columnar format: {output_format}")
+        if output_format == "arrow":
+            try:
+                import pyarrow
+            except ImportError:
+                raise ImportError("Arrow output requires the pyarrow package")
+            self._pa = pyarrow
+            self._schema = pyarrow.schema([('path', pyarrow.string()),
+                                           ('code', pyarrow.uint8()),
+                                           ('value', pyarrow.float64())])
+            self._arrow_writer = pyarrow.ipc.new_stream(stream, self._schema)
+        self.stream = stream
+        self.batch_size = batch_size
+        self.output_format = output_format
+        self.rows_written = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._paths = []
+        self._codes = array('B')
+        self._values = array('d')
+
+    def write(self, records: Iterable[CheckRecord]) -> None:
+        """Buffer records, flushing full batches.
+
+        Args:
+            records: Records to write (consumed lazily)
+        """
+        for path, code, value in records:
+            self._paths.append(path)
+            self._codes.append(code)
+            self._values.append(value)
+            if len(self._paths) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write any buffered rows as a batch."""
+        if not self._paths:
+            return
+        if self.output_format == "arrow":
+            batch = self._pa.record_batch([self._pa.array(self._paths),
+                                           self._pa.array(self._codes, self._pa.uint8()),
+                                           self._pa.array(self._values, self._pa.float64())],
+                                          schema=self._schema)
+            self._arrow_writer.write_batch(batch)
+        else:
+            self.stream.write(json.dumps({'path': self._paths,
+                                          'code': self._codes.tolist(),
+                                          'value': self._values.tolist()}))
+            self.stream.write("\n")
+        self.rows_written += len(self._paths)
+        self._reset()
+
+    def close(self) -> None:
+        """Flush remaining rows and finish the output."""
+        self.flush()
+        if self.output_format == "arrow":
+            self._arrow_writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,301 @@
+"""Texture validation tools for studio pipeline.
+
+Validates texture files against the ``materials`` section of
+studio_standards.yaml. Resolutions are read from image headers only
+(PNG IHDR, JPEG SOF, EXR dataWindow, TIFF IFD), so no pixel data is ever
+decoded and whole texture libraries can be checked across a process pool.
+"""
+
+import logging
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FORMAT_ALIASES = {'jpeg': 'jpg', 'tiff': 'tif'}
+
+# Image formats a texture library may contain, supported by the standards or not
+IMAGE_EXTENSIONS = frozenset(['jpg', 'jpeg', 'png', 'exr', 'tif', 'tiff', 'tga', 'bmp',
+                              'hdr', 'tx', 'psd', 'dds', 'gif', 'webp'])
+
+
+def _read_png_size(f: BinaryIO) -> Optional[Tuple[int, int]]:
+    header = f.read(24)
+    if len(header) < 24 or header[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", header[16:24])
+
+
+def _read_jpeg_size(f: BinaryIO) -> Optional[Tuple[int, int]]:
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte == b"\xff":
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0x01, 0xd8) or 0xd0 <= marker <= 0xd7:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        if length < 2:  # The length includes itself; anything less would loop
+            return None
+        if 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack(">HH", data[1:5])
+            return width, height
+        if marker == 0xda:  # Start of scan without a frame header
+            return None
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _read_exr_string(f: BinaryIO) -> bytes:
+    chars = []
+    while len(chars) < 256:
+        c = f.read(1)
+        if not c or c == b"\0":
+            break
+        chars.append(c)
+    return b"".join(chars)
+
+
+def _read_exr_size(f: BinaryIO) -> Optional[Tuple[int, int]]:
+    file_size = os.fstat(f.fileno()).st_size
+    f.seek(8)  # Magic number and version field
+    while True:
+        name = _read_exr_string(f)
+        if not name:
+            return None
+        _read_exr_string(f)  # Attribute type
+        size_bytes = f.read(4)
+        if len(size_bytes) < 4:
+            return None
+        size = struct.unpack("<i", size_bytes)[0]
+        if name == b"dataWindow":
+            data = f.read(16)
+            if len(data) < 16:
+                return None
+            xmin, ymin, xmax, ymax = struct.unpack("<iiii", data)
+            return xmax - xmin + 1, ymax - ymin + 1
+        # A corrupt size must never move the reader backwards or off the file
+        if size < 0 or f.tell() + size > file_size:
+            return None
+        f.seek(size, os.SEEK_CUR)
+
+
+def _read_tiff_size(f: BinaryIO, order: str) -> Optional[Tuple[int, int]]:
+    f.seek(4)
+    offset = struct.unpack(order + "I", f.read(4))[0]
+    f.seek(offset)
+    count_bytes = f.read(2)
+    if len(count_bytes) < 2:
+        return None
+    width = height = None
+    for _ in range(struct.unpack(order + "H", count_bytes)[0]):
+        entry = f.read(12)
+        if len(entry) < 12:
+            break
+        tag, field_type = struct.unpack(order + "HH", entry[:4])
+        if tag not in (256, 257):
+            continue
+        if field_type == 3:  # SHORT
+            value = struct.unpack(order + "H", entry[8:10])[0]
+        elif field_type == 4:  # LONG
+            value = struct.unpack(order + "I", entry[8:12])[0]
+        else:
+            continue
+        if tag == 256:
+            width = value
+        else:
+            height = value
+    if width is None or height is None:
+        return None
+    return width, height
+
+
+def read_image_size(path: str) -> Optional[Tuple[int, int]]:
+    """Read an image's resolution from its header without decoding pixels.
+
+    Supports PNG, JPEG, OpenEXR and TIFF; the format is detected from the
+    file's magic bytes rather than its extension.
+
+    Args:
+        path: Path to the image file
+
+    Returns:
+        Tuple of (width, height), or None if the header cannot be read
+    """
+    try:
+        with open(path, 'rb') as f:
+            magic = f.read(4)
+            f.seek(0)
+            if magic == b"\x89PNG":
+                return _read_png_size(f)
+            if magic[:2] == b"\xff\xd8":
+                return _read_jpeg_size(f)
+            if magic == b"\x76\x2f\x31\x01":
+                return _read_exr_size(f)
+            if magic == b"II*\0":
+                return _read_tiff_size(f, "<")
+            if magic == b"MM\0*":
+                return _read_tiff_size(f, ">")
+    except (OSError, struct.error) as e:
+        logger.debug(f"Could not read image header {path}: {e}")
+    return None
+
+
+def _inspect_texture(path: str) -> Tuple[str, Optional[Tuple[int, int]]]:
+    """Process pool worker: read one texture's resolution."""
+    return path, read_image_size(path)
+
+
+class TextureResult(NamedTuple):
+    """Validation result for a single texture file."""
+
+    path: str
+    material: Optional[str]
+    channel: Optional[str]
+    width: Optional[int]
+    height: Optional[int]
+    passed: bool
+    issues: List[str]
+
+
+class TextureChecker:
+    """Validate textures against studio materials standards."""
+
+    CHANNEL_ALIASES = {
+        'diffuse': ['diffuse', 'diff', 'albedo', 'basecolor', 'color'],
+        'specular': ['specular', 'spec'],
+        'normal': ['normal', 'nrm', 'norm'],
+    }
+
+    def __init__(self, standards: Optional[dict] = None):
+        """Initialize texture checker.
+
+        Args:
+            standards: ``materials`` standards dictionary
+                (defaults to studio_standards.yaml)
+        """
+        if standards is None:
+            from studio_tools.config import STUDIO_STANDARDS
+            standards = (STUDIO_STANDARDS.get('standards', {}) or {}).get('materials', {}) or {}
+        self.supported_formats = [fmt.lower() for fmt in standards.get(
+            'supported_texture_formats', ['jpg', 'png', 'exr', 'tif'])]
+        self.resolution_min = standards.get('texture_resolution_min', 1024)
+        self.resolution_max = standards.get('texture_resolution_max', 8192)
+        self.required_channels = list(standards.get(
+            'required_channels', ['diffuse', 'specular', 'normal']))
+
+        self._channel_lookup = {}
+        for channel in self.required_channels:
+            for alias in self.CHANNEL_ALIASES.get(channel, [channel]):
+                self._channel_lookup[alias] = channel
+        logger.info("TextureChecker initialized")
+
+    def parse_texture_name(self, path: str) -> Tuple[Optional[str], Optional[str]]:
+        """Split a texture file name into material and channel.
+
+        Expects ``<material>_<channel>[_suffix][.udim].<ext>``, for example
+        ``hero_skin_diffuse.1001.exr``.
+
+        Args:
+            path: Texture file path
+
+        Returns:
+            Tuple of (material, channel), either of which may be None
+        """
+        tokens = Path(path).name.split('.')[0].split('_')
+        for index in range(len(tokens) - 1, 0, -1):
+            channel = self._channel_lookup.get(tokens[index].lower())
+            if channel:
+                return '_'.join(tokens[:index]), channel
+        return None, None
+
+    def _evaluate(self, path: str, size: Optional[Tuple[int, int]]) -> TextureResult:
+        issues = []
+        material, channel = self.parse_texture_name(path)
+        fmt = Path(path).suffix.lower().lstrip('.')
+        fmt = FORMAT_ALIASES.get(fmt, fmt)
+        if fmt not in self.supported_formats:
+            issues.append(f"Unsupported texture format: {fmt}")
+
+        width = height = None
+        if size is None:
+            issues.append("Could not read image header")
+        else:
+            width, height = size
+            for label, value in (('width', width), ('height', height)):
+                if value < self.resolution_min:
+                    issues.append(f"Texture {label} {value} below minimum {self.resolution_min}")
+                elif value > self.resolution_max:
+                    issues.append(f"Texture {label} {value} above maximum {self.resolution_max}")
+
+        return TextureResult(path, material, channel, width, height, not issues, issues)
+
+    def check_texture(self, texture_path: str) -> TextureResult:
+        """Check a single texture file.
+
+        Args:
+            texture_path: Path to the texture
+
+        Returns:
+            TextureResult for the file
+        """
+        return self._evaluate(texture_path, read_image_size(texture_path))
+
+    def check_library(self, library_path: str, max_workers: Optional[int] = None,
+                      chunksize: int = 64) -> Dict:
+        """Check every texture below a directory using a process pool.
+
+        Every image file and every file named like a texture is checked, so
+        textures in unsupported formats are reported as such rather than
+        silently skipped (which would also show up as a missing channel).
+
+        Args:
+            library_path: Root of the texture library
+            max_workers: Number of worker processes (None = CPU count)
+            chunksize: Files handed to a worker at a time
+
+        Returns:
+            Dictionary with 'results' (List[TextureResult]) and
+            'missing_channels' (material -> list of missing channel names)
+        """
+        extensions = IMAGE_EXTENSIONS | set(self.supported_formats)
+        paths = []
+        for root, _, files in os.walk(library_path):
+            for name in files:
+                ext = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+                if ext in extensions or self.parse_texture_name(name)[1] is not None:
+                    paths.append(os.path.join(root, name))
+        paths.sort()
+
+        if len(paths) > chunksize:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                sizes = list(executor.map(_inspect_texture, paths, chunksize=chunksize))
+        else:
+            sizes = [_inspect_texture(path) for path in paths]
+
+        results = [self._evaluate(path, size) for path, size in sizes]
+
+        channels: Dict[str, set] = {}
+        for result in results:
+            if result.material:
+                channels.setdefault(result.material, set()).add(result.channel)
+        missing_channels = {}
+        for material, found in sorted(channels.items()):
+            missing = [c for c in self.required_channels if c not in found]
+            if missing:
+                missing_channels[material] = missing
+
+        logger.info(f"Checked {len(results)} textures in {library_path}, "
+                    f"{len(missing_channels)} materials missing channels")
+        return {'results': results, 'missing_channels': missing_channels}
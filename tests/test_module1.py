@@ -3,13 +3,29 @@
 Demonstrates how to test package functionality.
 """
 
+import io
+import json
+import os
+import struct
+import time
+
 import pytest
 from pathlib import Path
 from studio_tools.assets.importer import AssetImporter
 from studio_tools.shots.shot_creator import ShotCreator
+from studio_tools.shots.disk_usage import DiskUsageScanner
 from studio_tools.publishing.publisher import AssetPublisher
 from studio_tools.validation.asset_checker import AssetChecker
 from studio_tools.rendering.arnold import ArnoldRenderer
+from studio_tools.cli.main import run_command
+from studio_tools.filesystem.cache import MetadataCache, SharedStatTable
+from studio_tools.filesystem.journal import ChangeJournal
+from studio_tools.publishing.manifest import ManifestEntry, VersionManifest
+from studio_tools.publishing.retention import RetentionEngine, RetentionPolicy
+from studio_tools.validation.results import CheckCode, ColumnarWriter, write_jsonl
+from studio_tools.validation.texture_checker import TextureChecker, read_image_size
+from studio_tools.dependencies.graph import (DependencyGraph, asset_node, cache_node,
+                                             render_node, shot_node)
 
 
 class TestAssetImporter:
@@ -144,5 +160,672 @@ class TestArnoldRenderer:
         assert 'settings' in info
 
 
+class TestCommandLine:
+    """Tests for the studio-tools command line."""
+    
+    def test_check_missing_file(self, tmp_path, capsys):
+        """Test check command with a missing asset file."""
+        result = run_command(["check", str(tmp_path / "missing.fbx")])
+        assert result == 1
+        assert "FAIL" in capsys.readouterr().out
+    
+    def test_check_valid_file(self, tmp_path, capsys):
+        """Test check command with a valid asset file."""
+        asset = tmp_path / "character_model.fbx"
+        asset.write_bytes(b"data")
+        result = run_command(["check", str(asset)])
+        assert result == 0
+        assert "PASS" in capsys.readouterr().out
+    
+    def test_context_keeps_no_result_history(self, tmp_path):
+        """Test that a long-lived context does not accumulate results."""
+        from studio_tools.cli.main import ToolContext
+        
+        asset = tmp_path / "character_model.fbx"
+        asset.write_bytes(b"data")
+        context = ToolContext()
+        try:
+            for _ in range(3):
+                assert run_command(["check", str(asset)], context, io.StringIO()) == 0
+            assert context.checker.get_check_results() == []
+        finally:
+            context.close()
+    
+    def test_create_shots(self, tmp_path):
+        """Test create-shots command."""
+        result = run_command(["create-shots", "SQ010_SH010", "--project", str(tmp_path)])
+        assert result == 0
+        assert (tmp_path / "SQ010_SH010" / "renders").is_dir()
+    
+    def test_relative_paths_resolved_against_cwd(self, tmp_path, capsys):
+        """Test that relative paths use the client's directory, not the daemon's."""
+        (tmp_path / "model.fbx").write_bytes(b"data")
+        assert run_command(["check", "model.fbx"], cwd=str(tmp_path)) == 0
+        assert "PASS" in capsys.readouterr().out
+    
+    def test_invalid_command(self):
+        """Test that usage errors return an exit code instead of exiting."""
+        assert run_command(["unknown"]) == 2
+    
+    @pytest.mark.skipif(not hasattr(__import__("socket"), "AF_UNIX"),
+                        reason="Unix sockets not available")
+    def test_daemon_round_trip(self, tmp_path):
+        """Test forwarding a command to the worker daemon."""
+        import threading
+        from studio_tools.cli.client import send_request
+        from studio_tools.cli.daemon import ToolDaemon
+        
+        server = ToolDaemon(str(tmp_path / "tools.sock"))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            exit_code, output = send_request(server.socket_path,
+                                             ["render", "MyProject", "--samples", "8"])
+            assert exit_code == 0
+            assert '"samples": 8' in output
+            assert json.loads(output)['project'] == "MyProject"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_main_forwards_to_daemon(self, tmp_path, capsys, monkeypatch):
+        """Test that main() forwards commands to a listening daemon."""
+        import importlib
+        import threading
+        from studio_tools.cli.daemon import ToolDaemon
+
+        cli_main = importlib.import_module("studio_tools.cli.main")
+
+        server = ToolDaemon(str(tmp_path / "tools.sock"))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        # The daemon holds its own reference; main() must not fall back to running locally
+        monkeypatch.setattr(cli_main, "run_command", None)
+        try:
+            assert cli_main._forward_socket(["--socket", server.socket_path, "serve"]) is None
+            assert cli_main.main(["--socket", server.socket_path, "render", "MyProject"]) == 0
+            assert json.loads(capsys.readouterr().out)['project'] == "MyProject"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestMetadataCache:
+    """Tests for MetadataCache class."""
+    
+    def test_stat_hit_and_miss(self, tmp_path):
+        """Test that repeated lookups are served from the cache."""
+        cache = MetadataCache(ttl=60)
+        assert cache.is_dir(tmp_path) is True
+        assert cache.exists(tmp_path) is True
+        stats = cache.get_stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
+    
+    def test_invalidate_after_write(self, tmp_path):
+        """Test that invalidation picks up files created by the tools."""
+        cache = MetadataCache(ttl=60)
+        new_file = tmp_path / "model.fbx"
+        assert cache.listdir(tmp_path) == []
+        new_file.write_bytes(b"data")
+        assert cache.listdir(tmp_path) == []  # Stale until invalidated
+        cache.invalidate(new_file)
+        assert cache.listdir(tmp_path) == ["model.fbx"]
+
+    def test_missing_paths_not_cached(self, tmp_path):
+        """Test that a file created after a failed lookup is found without invalidation."""
+        table = SharedStatTable(tmp_path / "stat_table", slots=128)
+        cache = MetadataCache(ttl=60, shared_table=table)
+        new_file = tmp_path / "model.fbx"
+        assert cache.exists(new_file) is False
+        new_file.write_bytes(b"data")
+        assert cache.exists(new_file) is True
+        assert MetadataCache(ttl=60, shared_table=table).exists(new_file) is True
+    
+    def test_shared_table_between_caches(self, tmp_path):
+        """Test that stat results are shared through the mmapped table."""
+        table_path = tmp_path / "stat_table"
+        writer = MetadataCache(ttl=60, shared_table=SharedStatTable(table_path, slots=128))
+        reader = MetadataCache(ttl=60, shared_table=SharedStatTable(table_path))
+        assert writer.is_dir(tmp_path) is True
+        assert reader.is_dir(tmp_path) is True
+        assert reader.get_stats()['shared_hits'] == 1
+        writer.invalidate(tmp_path)
+        reader.clear()
+        reader.is_dir(tmp_path)
+        assert reader.get_stats()['misses'] == 1
+    
+    def test_publisher_versions_with_cache(self, tmp_path):
+        """Test auto-incremented versions see the publisher's own writes."""
+        publisher = AssetPublisher(str(tmp_path), fs_cache=MetadataCache(ttl=60))
+        assert publisher.publish_asset("char_hero", "hero.fbx") is True
+        assert publisher.publish_asset("char_hero", "hero.fbx") is True
+        versions = [a['version'] for a in publisher.get_published_assets()]
+        assert versions == ["v001", "v002"]
+
+
+class TestChangeJournal:
+    """Tests for ChangeJournal class."""
+    
+    def test_scan_records_changes(self, tmp_path):
+        """Test that scans record creates, modifies and deletes."""
+        root = tmp_path / "assets"
+        root.mkdir()
+        model = root / "model.fbx"
+        model.write_bytes(b"a")
+        journal = ChangeJournal([root], tmp_path / "state")
+        assert [e.kind for e in journal.scan()] == ["created"]
+        assert journal.scan() == []
+        
+        model.write_bytes(b"abc")
+        (root / "other.abc").write_bytes(b"b")
+        kinds = {e.path: e.kind for e in journal.scan()}
+        assert kinds == {str(model): "modified", str(root / "other.abc"): "created"}
+        
+        model.unlink()
+        assert [(e.kind, e.path) for e in journal.scan()] == [("deleted", str(model))]
+    
+    def test_consumer_cursor_persists(self, tmp_path):
+        """Test that consumers only see changes since their last run."""
+        root = tmp_path / "assets"
+        root.mkdir()
+        (root / "a.fbx").write_bytes(b"a")
+        ChangeJournal([root], tmp_path / "state").scan()
+        
+        journal = ChangeJournal([root], tmp_path / "state")
+        assert len(journal.consume("checker")) == 1
+        assert journal.consume("checker") == []
+        
+        (root / "b.fbx").write_bytes(b"b")
+        journal.scan()
+        reopened = ChangeJournal([root], tmp_path / "state")
+        assert [e.path for e in reopened.consume("checker")] == [str(root / "b.fbx")]
+        assert reopened.compact() == 2
+        assert reopened.consume("checker") == []
+
+    def test_read_ignores_torn_last_line(self, tmp_path):
+        """Test that a half-written journal line is not parsed."""
+        root = tmp_path / "assets"
+        root.mkdir()
+        (root / "a.fbx").write_bytes(b"a")
+        journal = ChangeJournal([root], tmp_path / "state")
+        journal.scan()
+        journal.commit("checker", 1)
+        with open(tmp_path / "state" / "journal.jsonl", 'ab') as f:
+            f.write(b'[2, "created", "/assets/b.f')
+        assert journal.read_changes("checker") == []
+        assert [e.seq for e in journal.read_changes("other")] == [1]
+
+    def test_watch_and_scan_record_each_change_once(self, tmp_path):
+        """Test that a watcher and a concurrent scanner never double-record."""
+        import threading
+
+        root = tmp_path / "assets"
+        root.mkdir()
+        watcher = ChangeJournal([root], tmp_path / "state")
+        scanner = ChangeJournal([root], tmp_path / "state")
+        thread = threading.Thread(target=watcher.watch, kwargs={'duration': 1.0,
+                                                                'poll_interval': 0.1})
+        thread.start()
+        time.sleep(0.2)
+        for name in ("a.fbx", "b.fbx", "c.fbx"):
+            (tmp_path / name).write_bytes(b"data")
+            os.rename(str(tmp_path / name), str(root / name))  # Never seen half-written
+            scanner.scan()
+        (root / "a.fbx").unlink()
+        scanner.scan()
+        thread.join()
+
+        events = [(e.kind, e.path) for e in scanner.read_changes("checker")]
+        assert sorted(events) == sorted([("created", str(root / name))
+                                         for name in ("a.fbx", "b.fbx", "c.fbx")]
+                                        + [("deleted", str(root / "a.fbx"))])
+        watcher.close()
+        scanner.close()
+
+    def test_instances_share_state(self, tmp_path):
+        """Test that two instances on one state dir never reuse a seq or replay a change."""
+        root = tmp_path / "assets"
+        root.mkdir()
+        first = ChangeJournal([root], tmp_path / "state")
+        second = ChangeJournal([root], tmp_path / "state")
+        first.scan()
+
+        (root / "a.fbx").write_bytes(b"a")
+        assert [e.seq for e in first.scan()] == [1]
+        (root / "b.fbx").write_bytes(b"b")
+        assert [(e.seq, e.path) for e in second.scan()] == [(2, str(root / "b.fbx"))]
+        assert first.scan() == []
+
+        (root / "c.fbx").write_bytes(b"c")
+        assert [e.seq for e in first.scan()] == [3]
+        assert [e.seq for e in second.consume("checker")] == [1, 2, 3]
+        first.close()
+        second.close()
+
+    def test_incremental_asset_checks(self, tmp_path):
+        """Test that the asset checker only checks changed assets."""
+        root = tmp_path / "assets"
+        root.mkdir()
+        (root / "prop_chair.fbx").write_bytes(b"a")
+        (root / "notes.txt").write_bytes(b"b")
+        journal = ChangeJournal([root], tmp_path / "state")
+        journal.scan()
+        
+        checker = AssetChecker()
+        results = checker.run_incremental_checks(journal)
+        assert list(results) == [str(root / "prop_chair.fbx")]
+        assert results[str(root / "prop_chair.fbx")][0] is True
+        assert checker.run_incremental_checks(journal) == {}
+
+
+class TestRetentionEngine:
+    """Tests for RetentionEngine class."""
+    
+    def _make_archive(self, tmp_path, count):
+        archive = tmp_path / "archive"
+        for version in range(1, count + 1):
+            (archive / "char_hero" / f"v{version:03d}").mkdir(parents=True)
+        return archive
+    
+    def test_policy_from_config(self):
+        """Test loading the retention policy from configuration."""
+        policy = RetentionPolicy.from_config()
+        assert policy.max_versions == 10
+        assert policy.archive_older_than_days == 90
+    
+    def test_plan_is_dry_run(self, tmp_path):
+        """Test planning deletes beyond max_versions without touching disk."""
+        archive = self._make_archive(tmp_path, 5)
+        engine = RetentionEngine(str(archive), RetentionPolicy(max_versions=3))
+        actions = engine.plan()
+        assert [(a.version, a.action) for a in actions] == [("v001", "delete"), ("v002", "delete")]
+        assert (archive / "char_hero" / "v001").exists()
+        assert "DELETE" in engine.format_plan(actions)
+    
+    def test_apply_moves_to_cold_storage(self, tmp_path):
+        """Test moving old versions to cold storage, keeping the newest."""
+        archive = self._make_archive(tmp_path, 3)
+        cold = tmp_path / "cold"
+        engine = RetentionEngine(str(archive), RetentionPolicy(max_versions=10,
+                                                               archive_older_than_days=1),
+                                 cold_storage_path=str(cold))
+        actions = engine.plan(now=time.time() + 2 * 86400)
+        assert [a.version for a in actions] == ["v001", "v002"]
+        result = engine.apply(actions, max_ops_per_second=None)
+        assert result == {'applied': 2, 'failed': 0}
+        assert (cold / "char_hero" / "v001").is_dir()
+        assert sorted(p.name for p in (archive / "char_hero").iterdir()) == ["v003"]
+
+    def test_apply_does_not_nest_into_existing_destination(self, tmp_path):
+        """Test that a version already in cold storage is reported as a failure."""
+        archive = self._make_archive(tmp_path, 2)
+        cold = tmp_path / "cold"
+        (cold / "char_hero" / "v001").mkdir(parents=True)
+        engine = RetentionEngine(str(archive), RetentionPolicy(max_versions=10,
+                                                               archive_older_than_days=1),
+                                 cold_storage_path=str(cold))
+        actions = engine.plan(now=time.time() + 2 * 86400)
+        assert engine.apply(actions, max_ops_per_second=None) == {'applied': 0, 'failed': 1}
+        assert (archive / "char_hero" / "v001").is_dir()
+        assert list((cold / "char_hero" / "v001").iterdir()) == []
+
+
+class TestDependencyGraph:
+    """Tests for DependencyGraph class."""
+    
+    def _build_graph(self, db_path=":memory:"):
+        graph = DependencyGraph(db_path)
+        rig = asset_node("char_hero", "v003")
+        prop = asset_node("prop_chair", "v001")
+        graph.add_dependencies([
+            (rig, shot_node("SQ010_SH010")),
+            (rig, shot_node("SQ010_SH020")),
+            (prop, shot_node("SQ010_SH030")),
+            (shot_node("SQ010_SH010"), cache_node("SQ010_SH010", "hero_anim")),
+        ])
+        graph.register_render("SQ010_SH010", ["beauty"], frames=(1001, 1100),
+                              inputs=[cache_node("SQ010_SH010", "hero_anim")])
+        return graph
+    
+    def test_reverse_lookup(self):
+        """Test finding which shots use an asset version."""
+        graph = self._build_graph()
+        assert graph.dependents(asset_node("char_hero", "v003")) == [
+            shot_node("SQ010_SH010"), shot_node("SQ010_SH020")]
+        assert graph.dependencies(shot_node("SQ010_SH030")) == [asset_node("prop_chair", "v001")]
+    
+    def test_rebuild_plan_in_topological_order(self):
+        """Test computing the minimal downstream rebuild for a changed rig."""
+        graph = self._build_graph()
+        affected = graph.affected([asset_node("char_hero", "v003")])
+        assert shot_node("SQ010_SH030") not in affected
+        assert affected.index(cache_node("SQ010_SH010", "hero_anim")) < \
+            affected.index(render_node("SQ010_SH010", "beauty"))
+        
+        plan = graph.rebuild_plan([asset_node("char_hero", "v003")])
+        assert [node['id'] for node in plan] == [cache_node("SQ010_SH010", "hero_anim"),
+                                                 render_node("SQ010_SH010", "beauty")]
+        assert plan[1]['attrs']['frames'] == [1001, 1100]
+    
+    def test_persisted_to_sqlite(self, tmp_path):
+        """Test that the graph survives reopening the database."""
+        db_path = str(tmp_path / "deps.db")
+        self._build_graph(db_path).close()
+        graph = DependencyGraph(db_path)
+        assert len(graph.rebuild_plan([asset_node("char_hero", "v003")])) == 2
+    
+    def test_cycle_detection(self):
+        """Test that cycles are reported instead of looping."""
+        graph = DependencyGraph()
+        graph.add_dependencies([("shot:A", "cache:A/x"), ("cache:A/x", "shot:A")])
+        with pytest.raises(ValueError):
+            graph.affected(["shot:A"])
+
+
+class TestStructuredResults:
+    """Tests for structured asset check results."""
+    
+    def test_iter_asset_checks_records(self, tmp_path):
+        """Test that checks yield compact records."""
+        asset = tmp_path / "prop_chair.fbx"
+        asset.write_bytes(b"x" * 1024)
+        checker = AssetChecker()
+        records = list(checker.iter_asset_checks([str(asset), str(tmp_path / "missing.fbx")]))
+        assert [r.code for r in records] == [CheckCode.FILE_FOUND, CheckCode.SIZE_OK,
+                                             CheckCode.FORMAT_OK, CheckCode.FILE_NOT_FOUND]
+        assert records[1].value == pytest.approx(1 / 1024)
+        assert [r.passed for r in records] == [True, True, True, False]
+        assert checker.get_check_results() == []
+    
+    def test_messages_unchanged(self, tmp_path):
+        """Test that rendered messages match the human-readable output."""
+        asset = tmp_path / "notes.txt"
+        asset.write_bytes(b"")
+        success, messages = AssetChecker().run_asset_checks(str(asset))
+        assert success is False
+        assert messages == ["✓ Asset file found: notes.txt",
+                            "✓ File size acceptable: 0.00MB",
+                            "❌ Unsupported file format: .txt"]
+    
+    def test_writers(self, tmp_path):
+        """Test JSON Lines and columnar batch output."""
+        records = list(AssetChecker().iter_asset_checks([str(tmp_path / "a.fbx")] * 3))
+        stream = io.StringIO()
+        assert write_jsonl(records, stream) == 3
+        assert json.loads(stream.getvalue().splitlines()[0])['code'] == "FILE_NOT_FOUND"
+        
+        stream = io.StringIO()
+        with ColumnarWriter(stream, batch_size=2) as writer:
+            writer.write(iter(records))
+        batches = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [len(b['code']) for b in batches] == [2, 1]
+        assert batches[0]['code'] == [int(CheckCode.FILE_NOT_FOUND)] * 2
+
+
+class TestDiskUsageScanner:
+    """Tests for DiskUsageScanner class."""
+    
+    def _make_project(self, tmp_path):
+        project = tmp_path / "project"
+        for shot_name in ("SQ010_SH010", "SQ010_SH020"):
+            ShotCreator(shot_name, str(project)).create_shot_directory()
+        (project / "SQ010_SH010" / "renders" / "beauty").mkdir()
+        (project / "SQ010_SH010" / "renders" / "beauty" / "f1001.exr").write_bytes(b"x" * 50000)
+        (project / "SQ010_SH020" / "cache" / "hero.abc").write_bytes(b"x" * 8192)
+        return project
+    
+    def test_per_shot_and_folder_totals(self, tmp_path):
+        """Test sorted per-shot and per-folder totals."""
+        project = self._make_project(tmp_path)
+        scanner = DiskUsageScanner(str(project))
+        entries = scanner.scan()
+        assert (entries[0].shot, entries[0].folder, entries[0].files) == \
+            ("SQ010_SH010", "renders", 1)
+        shots = scanner.shot_totals(entries)
+        assert [shot for shot, _ in shots] == ["SQ010_SH010", "SQ010_SH020"]
+        assert dict(scanner.folder_totals(entries))["cache"] == entries[1].bytes
+    
+    def test_hardlinks_counted_once(self, tmp_path):
+        """Test that hardlinked files are only counted once per project."""
+        project = self._make_project(tmp_path)
+        source = project / "SQ010_SH020" / "cache" / "hero.abc"
+        os.link(str(source), str(project / "SQ010_SH010" / "cache" / "hero.abc"))
+        entries = DiskUsageScanner(str(project)).scan()
+        assert sum(e.files for e in entries) == 2
+    
+    def test_incremental_cache(self, tmp_path):
+        """Test that cached directory totals are reused and refreshed on change."""
+        project = self._make_project(tmp_path)
+        cache_file = tmp_path / "du_cache.json"
+        first = DiskUsageScanner(str(project), cache_path=str(cache_file)).scan()
+        scanner = DiskUsageScanner(str(project), cache_path=str(cache_file))
+        assert scanner.scan() == first
+        
+        (project / "SQ010_SH020" / "fx" / "sim.vdb").write_bytes(b"x" * 100000)
+        entries = scanner.scan()
+        assert (entries[0].shot, entries[0].folder) == ("SQ010_SH020", "fx")
+
+
+def _png_header(width, height):
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I4sII", 13, b"IHDR", width, height) + bytes(5)
+
+
+def _jpeg_header(width, height):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\0" + bytes(9)
+    sof0 = b"\xff\xc0" + struct.pack(">HBHH", 11, 8, height, width) + bytes(4)
+    return b"\xff\xd8" + app0 + sof0
+
+
+def _exr_header(width, height):
+    channels = b"channels\0chlist\0" + struct.pack("<i", 1) + b"\0"
+    window = b"dataWindow\0box2i\0" + struct.pack("<iiiii", 16, 0, 0, width - 1, height - 1)
+    return b"\x76\x2f\x31\x01" + struct.pack("<I", 2) + channels + window + b"\0"
+
+
+def _tiff_header(width, height):
+    entries = struct.pack("<HHIHH", 256, 3, 1, width, 0) + struct.pack("<HHII", 257, 4, 1, height)
+    return b"II*\0" + struct.pack("<IH", 8, 2) + entries + struct.pack("<I", 0)
+
+
+class TestTextureChecker:
+    """Tests for TextureChecker class."""
+    
+    @pytest.mark.parametrize("name,header", [
+        ("tex.png", _png_header(2048, 1024)),
+        ("tex.jpg", _jpeg_header(2048, 1024)),
+        ("tex.exr", _exr_header(2048, 1024)),
+        ("tex.tif", _tiff_header(2048, 1024)),
+    ])
+    def test_read_image_size(self, tmp_path, name, header):
+        """Test reading resolution from image headers."""
+        texture = tmp_path / name
+        texture.write_bytes(header)
+        assert read_image_size(str(texture)) == (2048, 1024)
+
+    @pytest.mark.parametrize("name,header", [
+        ("negative.exr", b"\x76\x2f\x31\x01" + struct.pack("<I", 2) + b"a\0b\0"
+         + struct.pack("<i", -8)),
+        ("overrun.exr", b"\x76\x2f\x31\x01" + struct.pack("<I", 2) + b"a\0b\0"
+         + struct.pack("<i", 1 << 30)),
+        ("zero_length.jpg", b"\xff\xd8\xff\xe0\x00\x00"),
+    ])
+    def test_read_image_size_corrupt_header(self, tmp_path, name, header):
+        """Test that corrupt headers are rejected instead of looping."""
+        texture = tmp_path / name
+        texture.write_bytes(header)
+        assert read_image_size(str(texture)) is None
+    
+    def test_check_texture_resolution(self, tmp_path):
+        """Test resolution limits from the materials standards."""
+        checker = TextureChecker()
+        small = tmp_path / "hero_skin_diffuse.png"
+        small.write_bytes(_png_header(512, 512))
+        result = checker.check_texture(str(small))
+        assert result.passed is False
+        assert (result.material, result.channel) == ("hero_skin", "diffuse")
+        
+        good = tmp_path / "hero_skin_normal.exr"
+        good.write_bytes(_exr_header(4096, 4096))
+        assert checker.check_texture(str(good)).passed is True
+    
+    def test_check_library_missing_channels(self, tmp_path):
+        """Test reporting missing channels per material across a process pool."""
+        (tmp_path / "hero_skin_diffuse.png").write_bytes(_png_header(2048, 2048))
+        (tmp_path / "hero_skin_spec.jpg").write_bytes(_jpeg_header(2048, 2048))
+        (tmp_path / "hero_skin_normal.tif").write_bytes(_tiff_header(2048, 2048))
+        (tmp_path / "chair_wood_albedo.exr").write_bytes(_exr_header(1024, 1024))
+        report = TextureChecker().check_library(str(tmp_path), max_workers=2, chunksize=1)
+        assert len(report['results']) == 4
+        assert all(result.passed for result in report['results'])
+        assert report['missing_channels'] == {'chair_wood': ['specular', 'normal']}
+
+    def test_check_library_reports_unsupported_formats(self, tmp_path):
+        """Test that textures in unsupported formats are reported, not skipped."""
+        (tmp_path / "hero_skin_diffuse.tga").write_bytes(b"\0" * 18)
+        (tmp_path / "hero_skin_spec.jpg").write_bytes(_jpeg_header(2048, 2048))
+        (tmp_path / "hero_skin_normal.tif").write_bytes(_tiff_header(2048, 2048))
+        (tmp_path / "notes.txt").write_bytes(b"notes")
+        report = TextureChecker().check_library(str(tmp_path))
+        failed = [result for result in report['results'] if not result.passed]
+        assert len(report['results']) == 3
+        assert [result.channel for result in failed] == ['diffuse']
+        assert "Unsupported texture format: tga" in failed[0].issues
+        assert report['missing_channels'] == {}
+
+
+def _append_versions(directory, name):
+    manifest = VersionManifest(directory, max_segments=2)
+    for version in range(1, 101):
+        manifest.append([ManifestEntry(name, version, f"/{name}/{version}", 1.0)])
+    manifest.close()
+
+
+class TestVersionManifest:
+    """Tests for VersionManifest class."""
+    
+    def test_append_and_lookup(self, tmp_path):
+        """Test binary-search lookups across appended segments."""
+        manifest = VersionManifest(tmp_path / "manifest")
+        manifest.append([ManifestEntry("prop_chair", v, f"/archive/prop_chair/v{v:03d}", 1.0)
+                         for v in (3, 1, 2)])
+        manifest.append([ManifestEntry("char_hero", 1, "/archive/char_hero/v001", 2.0, "ab" * 32)])
+        assert [e.version for e in manifest.versions("prop_chair")] == [1, 2, 3]
+        assert manifest.latest("prop_chair").version == 3
+        assert manifest.get("char_hero", 1).checksum == "ab" * 32
+        assert manifest.get("char_hero", 2) is None
+        assert manifest.latest("missing") is None
+        assert [e.name for e in manifest] == ["char_hero"] + ["prop_chair"] * 3
+    
+    def test_newer_segment_wins_and_compact(self, tmp_path):
+        """Test that re-recorded versions override older records after compaction."""
+        manifest = VersionManifest(tmp_path / "manifest", max_segments=2)
+        for path in ("/old", "/new", "/newest"):
+            manifest.append([ManifestEntry("prop_chair", 1, path, 1.0)])
+        assert len(list((tmp_path / "manifest").glob("segment-*.stm"))) == 1
+        assert manifest.get("prop_chair", 1).path == "/newest"
+        
+        reopened = VersionManifest(tmp_path / "manifest")
+        assert len(reopened) == 1
+        assert reopened.versions("prop_chair")[0].path == "/newest"
+
+    def test_appends_only_merge_similar_segments(self, tmp_path):
+        """Test that appends leave a large older segment alone until compact()."""
+        directory = tmp_path / "manifest"
+        manifest = VersionManifest(directory, max_segments=2)
+        manifest.append([ManifestEntry("prop_chair", v, f"/v{v}", 1.0) for v in range(1, 9)])
+        big = next(directory.glob("segment-*.stm"))
+        big_inode = big.stat().st_ino
+        for version in (9, 10, 11):
+            manifest.append([ManifestEntry("prop_chair", version, f"/v{version}", 1.0)])
+        assert len(list(directory.glob("segment-*.stm"))) == 2
+        assert big.stat().st_ino == big_inode
+        assert [e.version for e in manifest.versions("prop_chair")] == list(range(1, 12))
+
+        manifest.compact()
+        assert len(list(directory.glob("segment-*.stm"))) == 1
+        assert manifest.latest("prop_chair").version == 11
+
+    def test_publisher_records_manifest(self, tmp_path):
+        """Test that the publisher records versions and checksums in the manifest."""
+        asset = tmp_path / "hero.fbx"
+        asset.write_bytes(b"mesh")
+        manifest = VersionManifest(tmp_path / "manifest")
+        publisher = AssetPublisher(str(tmp_path / "archive"), manifest=manifest)
+        assert publisher.publish_asset("char_hero", str(asset)) is True
+        assert publisher.publish_asset("char_hero", str(asset)) is True
+        entry = manifest.latest("char_hero")
+        assert entry.version == 2
+        assert len(entry.checksum) == 64
+
+    def test_failed_publish_leaves_no_trace(self, tmp_path, monkeypatch):
+        """Test that a rejected name or failed manifest write creates nothing."""
+        asset = tmp_path / "hero.fbx"
+        asset.write_bytes(b"mesh")
+        archive = tmp_path / "archive"
+        manifest = VersionManifest(tmp_path / "manifest")
+        publisher = AssetPublisher(str(archive), manifest=manifest)
+        assert publisher.publish_asset("x" * 65, str(asset)) is False
+        assert not (archive / ("x" * 65)).exists()
+
+        def fail(entries):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(manifest, "append", fail)
+        assert publisher.publish_asset("char_hero", str(asset)) is False
+        assert publisher.publish_asset("char_hero", str(asset), version=3) is False
+        assert list((archive / "char_hero").iterdir()) == []
+        assert publisher.get_published_assets() == []
+
+    def test_publishers_sharing_manifest_never_reuse_versions(self, tmp_path):
+        """Test that two publishers on one manifest hand out distinct versions."""
+        archive = str(tmp_path / "archive")
+        publisher_a = AssetPublisher(archive, fs_cache=MetadataCache(ttl=60),
+                                     manifest=VersionManifest(tmp_path / "manifest"))
+        publisher_b = AssetPublisher(archive, fs_cache=MetadataCache(ttl=60),
+                                     manifest=VersionManifest(tmp_path / "manifest"))
+        for publisher in (publisher_a, publisher_b, publisher_a, publisher_b):
+            assert publisher.publish_asset("char_hero", "hero.fbx") is True
+        versions = [a['version'] for p in (publisher_a, publisher_b)
+                    for a in p.get_published_assets()]
+        assert sorted(versions) == ["v001", "v002", "v003", "v004"]
+    
+    def test_stale_manifest_skips_existing_version(self, tmp_path):
+        """Test that versions already in the archive are skipped."""
+        archive = tmp_path / "archive"
+        manifest = VersionManifest(tmp_path / "manifest")
+        manifest.append([ManifestEntry("char_hero", 1, str(archive / "char_hero" / "v001"), 1.0)])
+        (archive / "char_hero" / "v002").mkdir(parents=True)
+        publisher = AssetPublisher(str(archive), manifest=manifest)
+        assert publisher.publish_asset("char_hero", "hero.fbx") is True
+        assert publisher.get_published_assets()[-1]['version'] == "v003"
+
+    def test_refresh_tolerates_segment_removed_after_glob(self, tmp_path, monkeypatch):
+        """Test that a segment merged away between glob and stat is skipped."""
+        directory = tmp_path / "manifest"
+        manifest = VersionManifest(directory)
+        manifest.append([ManifestEntry("char_hero", 1, "/v001", 1.0)])
+        manifest.append([ManifestEntry("char_hero", 2, "/v002", 1.0)])
+        listed = sorted(directory.glob("segment-*.stm"))
+        listed[0].unlink()
+        monkeypatch.setattr(Path, "glob", lambda self, pattern: iter(listed))
+        manifest.refresh()
+        assert [e.version for e in manifest] == [2]
+
+    def test_concurrent_merges_lose_no_records(self, tmp_path):
+        """Test that processes appending to and merging one directory keep every record."""
+        import multiprocessing
+
+        directory = str(tmp_path / "manifest")
+        workers = [multiprocessing.Process(target=_append_versions, args=(directory, f"asset_{i}"))
+                   for i in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        assert [worker.exitcode for worker in workers] == [0, 0, 0, 0]
+        assert len(VersionManifest(directory)) == 400
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file